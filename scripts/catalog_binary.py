@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+Memory-Mapped Course Lookup File
+
+Packs the catalog and registry into one binary file that a script can mmap
+and query by Course_ID straight away. Nothing is parsed up front and no dict
+is built, so opening it costs a header read instead of json.load over both
+files.
+
+Layout of data/course_lookup.bin (little-endian):
+  header        HEADER — magic, version, record size/count, bucket count,
+                section offsets, sha256 of the catalog + registry it was built from
+                (CatalogLookup.is_current compares it to the files on disk;
+                --lookup and --benchmark report a stale file)
+  displacements bucket_count x uint32 — minimal perfect hash (see below)
+  records       record_count x RECORD, stored in hash-slot order
+  string pool   UTF-8 text, each distinct string stored once; records refer
+                to it by (offset, length)
+
+Each record holds the merged view of one course: catalog fields win over the
+registry (as in course-resolver.ts), numbers and flags are fixed-width, and
+free text goes to the string pool.
+
+Minimal perfect hash ("hash and displace"): blake2b(Course_ID) yields a bucket
+and two values f1, f2. Each bucket stores a displacement d, and the course's
+record is at slot (f1 + (d // n) * f2 + d % n) % n, where n is the record
+count. The displacements are chosen at build time (biggest buckets first) so
+every course gets its own slot and no slot is left empty. The slot's stored
+Course_ID is compared on lookup, so unknown IDs come back as None.
+
+Written by cleanse_course_data.py after export and by reconcile.py --apply.
+
+Usage:
+  python scripts/catalog_binary.py                        # rebuild from catalog + registry
+  python scripts/catalog_binary.py --benchmark            # vs json.load + dict construction
+  python scripts/catalog_binary.py --lookup FNCE6110 ...  # print records
+"""
+
+import hashlib
+import math
+import mmap
+import random
+import statistics
+import struct
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from catalog_distribution import content_hash
+from reconcile import BASE_DIR, CATALOG_PATH, REGISTRY_PATH, load_json, parse_credit_units
+from requirement_model import build_quarter_lookup
+
+BINARY_PATH = BASE_DIR / "data" / "course_lookup.bin"
+
+# ============================================================================
+# Format
+# ============================================================================
+
+MAGIC = b"CHLOOKUP"
+VERSION = 1
+
+# magic, version, record size, record count, bucket count,
+# displacements offset, records offset, pool offset, pool bytes, source sha256
+HEADER = struct.Struct("<8sHHIIIIII32s")
+
+BUCKET_LOAD = 4  # average keys per hash bucket
+DISPLACEMENT = struct.Struct("<I")
+
+FLAG_BITS = {
+    "in_catalog": 1,
+    "in_registry": 2,
+    "currently_offered": 4,
+    "is_wharton": 8,
+    "is_crosslisted": 16,
+    "name_updated": 32,
+}
+TERM_BITS = {"Fall": 1, "Spring": 2}
+TERM_NAMES = {0: "", 1: "Fall", 2: "Spring", 3: "Both"}
+
+# Free-text fields kept in the string pool, in record order
+STRING_FIELDS = [
+    "course_title", "description", "prerequisites", "corequisites",
+    "instructors_fall", "instructors_spring",
+    "meeting_times_fall", "meeting_times_spring",
+    "locations_fall", "locations_spring",
+    "crosslist_with", "canvas_url", "syllabi_url", "catalog_source",
+]
+
+# course_id, department, credit units in hundredths (0xFFFF = unknown; some
+# courses are 0.25 CU), flags, term bits, quarter mask, course level (255 =
+# unknown), section counts fall/spring, total capacity, ratings fall/spring
+# (NaN = none), then (offset, length) per string
+ID_BYTES = 12
+RECORD = struct.Struct(f"<{ID_BYTES}s4sHBBBBBBHff" + "II" * len(STRING_FIELDS))
+CREDIT_FIELD = struct.Struct("<H")
+UNKNOWN_BYTE = 255
+UNKNOWN_CREDITS = 0xFFFF
+
+CourseRecord = namedtuple("CourseRecord", [
+    "course_id", "department", "credit_units", *FLAG_BITS, "term_availability",
+    "quarter_mask", "course_level", "section_count_fall", "section_count_spring",
+    "total_capacity", "average_rating_fall", "average_rating_spring", *STRING_FIELDS,
+])
+
+
+# ============================================================================
+# Minimal Perfect Hash
+# ============================================================================
+
+def _key_hash(key):
+    """bytes -> (bucket hash, f1, f2)."""
+    h = int.from_bytes(hashlib.blake2b(key, digest_size=12).digest(), "little")
+    return h & 0xFFFFFFFF, (h >> 32) & 0xFFFFFFFF, h >> 64
+
+
+def _slot(f1, f2, d, n):
+    return (f1 + (d // n) * f2 + d % n) % n
+
+
+def build_perfect_hash(keys):
+    """Displacements for keys; returns (displacements, slot of each key)."""
+    n = len(keys)
+    bucket_count = max(1, math.ceil(n / BUCKET_LOAD))
+    buckets = [[] for _ in range(bucket_count)]
+    for i, key in enumerate(keys):
+        g, f1, f2 = _key_hash(key)
+        buckets[g % bucket_count].append((i, f1, f2))
+
+    displacements = [0] * bucket_count
+    slots = [None] * n
+    taken = [False] * n
+    for b in sorted(range(bucket_count), key=lambda b: -len(buckets[b])):
+        members = buckets[b]
+        if not members:
+            continue
+        for d in range(n * n):
+            candidate = [_slot(f1, f2, d, n) for _, f1, f2 in members]
+            if len(set(candidate)) == len(candidate) and not any(taken[s] for s in candidate):
+                break
+        else:
+            raise ValueError(f"No displacement found for hash bucket {b}")
+        displacements[b] = d
+        for (i, _, _), s in zip(members, candidate):
+            slots[i] = s
+            taken[s] = True
+    return displacements, slots
+
+
+# ============================================================================
+# Build
+# ============================================================================
+
+def _text(value):
+    return "" if value is None else str(value)
+
+
+def _small_int(value, limit=UNKNOWN_BYTE):
+    try:
+        return min(int(float(value)), limit)
+    except (TypeError, ValueError):
+        return None
+
+
+def _flag(value):
+    """True / 'TRUE' / 'Yes' (any case) -> True; anything else -> False."""
+    if isinstance(value, str):
+        return value.strip().upper() in ("TRUE", "YES")
+    return value is True
+
+
+def _rating(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def merged_records(catalog, registry):
+    """Course ID -> CourseRecord over catalog + registry (catalog wins)."""
+    quarters = build_quarter_lookup(catalog)
+    records = {}
+    for r in registry:
+        cu = r.get("credit_units")
+        records[r["course_id"]] = {
+            "course_id": r["course_id"],
+            "department": r.get("department") or r["course_id"][:4],
+            "credit_units": None if cu is None else float(cu),
+            "in_registry": True,
+            "currently_offered": bool(r.get("currently_offered")),
+            "is_wharton": bool(r.get("is_wharton")),
+            "course_title": _text(r.get("course_title")),
+            "catalog_source": _text(r.get("catalog_source")),
+        }
+    for c in catalog:
+        record = records.setdefault(c["Course_ID"], {"course_id": c["Course_ID"], "is_wharton": True})
+        cu = parse_credit_units(c.get("Credit_Units"))
+        level = _small_int(c.get("Course_Level"))
+        record.update({
+            "department": c.get("Department") or c["Course_ID"][:4],
+            "credit_units": cu if cu is not None else record.get("credit_units"),
+            "in_catalog": True,
+            "currently_offered": True,
+            "is_crosslisted": _flag(c.get("Is_Crosslisted")),
+            "name_updated": _flag(c.get("Name_Updated")),
+            "term_availability": c.get("Term_Availability") if c.get("Term_Availability") in ("Fall", "Spring", "Both") else "",
+            "quarter_mask": quarters.get(c["Course_ID"], 0),
+            "course_level": level,
+            "section_count_fall": _small_int(c.get("Section_Count_Fall")) or 0,
+            "section_count_spring": _small_int(c.get("Section_Count_Spring")) or 0,
+            "total_capacity": _small_int(c.get("Total_Capacity"), 0xFFFF) or 0,
+            "average_rating_fall": _rating(c.get("Average_Rating_Fall")),
+            "average_rating_spring": _rating(c.get("Average_Rating_Spring")),
+            **{field: _text(c.get(field.title().replace("_Url", "_URL"))) for field in STRING_FIELDS
+               if field not in ("course_title", "catalog_source")},
+            "course_title": _text(c.get("Course_Title")) or record.get("course_title", ""),
+        })
+
+    defaults = {field: False for field in FLAG_BITS}
+    defaults.update({
+        "term_availability": "", "quarter_mask": 0, "course_level": None,
+        "section_count_fall": 0, "section_count_spring": 0, "total_capacity": 0,
+        "average_rating_fall": math.nan, "average_rating_spring": math.nan,
+        **{field: "" for field in STRING_FIELDS},
+    })
+    return {cid: CourseRecord(**{**defaults, **record}) for cid, record in sorted(records.items())}
+
+
+def source_digest(catalog, registry):
+    """sha256 (bytes) of the catalog + registry a lookup file is built from."""
+    return bytes.fromhex(content_hash({"catalog": catalog, "registry": registry}))
+
+
+def write_catalog_binary(catalog, registry, log=print):
+    """Build the lookup file from catalog + registry records; returns the record count."""
+    records = merged_records(catalog, registry)
+    keys = [cid.encode("ascii") for cid in records]
+    if any(len(k) > ID_BYTES for k in keys):
+        raise ValueError(f"Course IDs longer than {ID_BYTES} bytes cannot be stored")
+    displacements, slots = build_perfect_hash(keys)
+
+    pool = bytearray()
+    pool_offsets = {"": 0}
+    packed = [None] * len(keys)
+    for (cid, record), key, slot in zip(records.items(), keys, slots):
+        refs = []
+        for field in STRING_FIELDS:
+            text = getattr(record, field)
+            if text not in pool_offsets:
+                pool_offsets[text] = len(pool)
+                pool += text.encode("utf-8")
+            refs += [pool_offsets[text], len(text.encode("utf-8"))]
+        flags = sum(bit for field, bit in FLAG_BITS.items() if getattr(record, field))
+        terms = {"Both": 3}.get(record.term_availability, TERM_BITS.get(record.term_availability, 0))
+        packed[slot] = RECORD.pack(
+            key, record.department.encode("ascii")[:4],
+            UNKNOWN_CREDITS if record.credit_units is None else round(record.credit_units * 100),
+            flags, terms, record.quarter_mask,
+            UNKNOWN_BYTE if record.course_level is None else record.course_level,
+            record.section_count_fall, record.section_count_spring, record.total_capacity,
+            record.average_rating_fall, record.average_rating_spring, *refs,
+        )
+
+    displacements_offset = HEADER.size
+    records_offset = displacements_offset + DISPLACEMENT.size * len(displacements)
+    records_offset += -records_offset % 8
+    pool_offset = records_offset + RECORD.size * len(packed)
+    header = HEADER.pack(
+        MAGIC, VERSION, RECORD.size, len(packed), len(displacements),
+        displacements_offset, records_offset, pool_offset, len(pool),
+        source_digest(catalog, registry),
+    )
+
+    payload = bytearray(header)
+    for d in displacements:
+        payload += DISPLACEMENT.pack(d)
+    payload += b"\0" * (records_offset - len(payload))
+    for record in packed:
+        payload += record
+    payload += pool
+
+    BINARY_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = BINARY_PATH.with_name(f".{BINARY_PATH.name}.tmp")
+    tmp_path.write_bytes(payload)
+
+    # Every course must resolve to its own record before the file is swapped in
+    with CatalogLookup(tmp_path) as lookup:
+        if not all(_same(lookup.get(cid), _stored(record)) for cid, record in records.items()):
+            tmp_path.unlink()
+            raise ValueError("Course lookup file does not reproduce the source records")
+    tmp_path.replace(BINARY_PATH)
+
+    log(f"Course lookup file: {len(packed)} records x {RECORD.size} bytes, "
+        f"{len(pool_offsets)} pooled strings ({len(pool):,} bytes), "
+        f"{len(displacements)} hash buckets, {len(payload):,} bytes total")
+    return len(packed)
+
+
+def _same(a, b):
+    """Record equality with NaN ratings comparing equal."""
+    return a is not None and all(x == y or (x != x and y != y) for x, y in zip(a, b))
+
+
+def _stored(record):
+    """A record as it reads back (ratings round-trip through float32)."""
+    def f32(value):
+        return struct.unpack("<f", struct.pack("<f", value))[0]
+    return record._replace(
+        average_rating_fall=f32(record.average_rating_fall),
+        average_rating_spring=f32(record.average_rating_spring),
+    )
+
+
+# ============================================================================
+# Reader
+# ============================================================================
+
+class CatalogLookup:
+    """mmap reader for the course lookup file.
+
+        with CatalogLookup() as lookup:
+            lookup.get("FNCE6110").course_title
+            lookup.credit_units("OIDD6110")   # 0.5
+    """
+
+    def __init__(self, path=BINARY_PATH):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, record_size, self._count, self._buckets, self._displacements,
+         self._records, self._pool, _, self.source_sha256) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} course lookup file")
+
+    def is_current(self, catalog=None, registry=None):
+        """Whether the file was built from these sources (default: the catalog and registry on disk)."""
+        catalog = load_json(CATALOG_PATH) if catalog is None else catalog
+        registry = load_json(REGISTRY_PATH) if registry is None else registry
+        return self.source_sha256 == source_digest(catalog, registry)
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def _offset(self, course_id):
+        """Byte offset of the course's record, or None if it isn't in the file."""
+        if not self._count:
+            return None
+        key = course_id.encode("ascii", "replace")
+        g, f1, f2 = _key_hash(key)
+        (d,) = DISPLACEMENT.unpack_from(self._mm, self._displacements + DISPLACEMENT.size * (g % self._buckets))
+        offset = self._records + RECORD.size * _slot(f1, f2, d, self._count)
+        if self._mm[offset:offset + ID_BYTES].rstrip(b"\0") != key:
+            return None
+        return offset
+
+    def __contains__(self, course_id):
+        return self._offset(course_id) is not None
+
+    def __iter__(self):
+        """Course IDs in slot order."""
+        for i in range(self._count):
+            offset = self._records + RECORD.size * i
+            yield self._mm[offset:offset + ID_BYTES].rstrip(b"\0").decode("ascii")
+
+    def credit_units(self, course_id):
+        """Credit units without decoding the rest of the record (None if unknown)."""
+        offset = self._offset(course_id)
+        if offset is None:
+            return None
+        (credits,) = CREDIT_FIELD.unpack_from(self._mm, offset + ID_BYTES + 4)
+        return None if credits == UNKNOWN_CREDITS else credits / 100
+
+    def get(self, course_id):
+        offset = self._offset(course_id)
+        if offset is None:
+            return None
+        (cid, department, credits, flags, terms, quarter_mask, level, sections_fall,
+         sections_spring, capacity, rating_fall, rating_spring, *refs) = RECORD.unpack_from(self._mm, offset)
+        pool = self._pool
+        strings = [
+            self._mm[pool + start:pool + start + length].decode("utf-8")
+            for start, length in zip(refs[::2], refs[1::2])
+        ]
+        return CourseRecord(
+            cid.rstrip(b"\0").decode("ascii"), department.rstrip(b"\0").decode("ascii"),
+            None if credits == UNKNOWN_CREDITS else credits / 100,
+            *(bool(flags & bit) for bit in FLAG_BITS.values()),
+            TERM_NAMES[terms], quarter_mask, None if level == UNKNOWN_BYTE else level,
+            sections_fall, sections_spring, capacity, rating_fall, rating_spring, *strings,
+        )
+
+
+# ============================================================================
+# Benchmark
+# ============================================================================
+
+def _median_seconds(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def run_benchmark(lookups=100000, seed=7):
+    def json_startup():
+        catalog = load_json(CATALOG_PATH)
+        registry = load_json(REGISTRY_PATH)
+        by_id = {r["course_id"]: r for r in registry}
+        by_id.update({c["Course_ID"]: c for c in catalog})
+        return by_id
+
+    def binary_startup():
+        CatalogLookup().close()
+
+    json_open = _median_seconds(json_startup, 20)
+    binary_open = _median_seconds(binary_startup, 200)
+
+    by_id = json_startup()
+    rng = random.Random(seed)
+    known = sorted(by_id)
+    ids = [rng.choice(known) if rng.random() < 0.9 else f"ZZZZ{rng.randrange(10000):04d}"
+           for _ in range(lookups)]
+
+    with CatalogLookup() as lookup:
+        if not lookup.is_current():
+            print("  STALE: lookup file was built from a different catalog + registry; rebuild it")
+            return 1
+        if sorted(lookup) != known:
+            print("  MISMATCH: lookup file and catalog + registry have different course IDs")
+            return 1
+        dict_seconds = _median_seconds(lambda: [by_id.get(cid) for cid in ids], 5)
+        record_seconds = _median_seconds(lambda: [lookup.get(cid) for cid in ids], 5)
+        units_seconds = _median_seconds(lambda: [lookup.credit_units(cid) for cid in ids], 5)
+        size = BINARY_PATH.stat().st_size
+
+    per_lookup = lambda seconds: seconds / lookups * 1e6
+    print(f"  Courses:                       {len(known)} ({size:,} byte lookup file)")
+    print(f"  Startup  json.load + dicts:    {json_open * 1e3:8.2f} ms")
+    print(f"  Startup  mmap open:            {binary_open * 1e3:8.3f} ms  ({json_open / binary_open:,.0f}x faster)")
+    print(f"  Lookup   dict.get:             {per_lookup(dict_seconds):8.3f} µs")
+    print(f"  Lookup   mmap full record:     {per_lookup(record_seconds):8.3f} µs")
+    print(f"  Lookup   mmap credit units:    {per_lookup(units_seconds):8.3f} µs")
+    breakeven = (json_open - binary_open) / max(per_lookup(record_seconds - dict_seconds) / 1e6, 1e-12)
+    print(f"  Break-even:                    ~{breakeven:,.0f} full-record lookups per process")
+    return 0
+
+
+def main():
+    print(f"CourseHub Course Lookup File — {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    if "--lookup" in sys.argv:
+        with CatalogLookup() as lookup:
+            if not lookup.is_current():
+                print(f"  WARNING: {BINARY_PATH.relative_to(BASE_DIR)} is stale (built from a different "
+                      "catalog + registry); run python scripts/catalog_binary.py to rebuild it")
+            for cid in sys.argv[sys.argv.index("--lookup") + 1:]:
+                print(f"  {cid}: {lookup.get(cid)}")
+        return 0
+
+    write_catalog_binary(load_json(CATALOG_PATH), load_json(REGISTRY_PATH))
+    print(f"  Wrote {BINARY_PATH.relative_to(BASE_DIR)}")
+
+    if "--benchmark" in sys.argv:
+        print()
+        return run_benchmark()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
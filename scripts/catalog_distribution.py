@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Catalog Delta Distribution
+
+Publishes each catalog build as a numbered version so clients and CDN edges
+only refetch what changed:
+
+  data/catalog/
+    manifest.json                         — the only mutable file (short cache TTL)
+    catalog.<sha12>.json                  — full snapshot, content-hashed (immutable)
+    patch.v<N-1>-v<N>.<sha12>.json        — record-level delta, content-hashed (immutable)
+
+A patch lists courses added (full records), removed (IDs) and changed (only the
+fields that differ; fields a record no longer has are listed separately in
+removed_fields). A client on version N-1 fetches the manifest, downloads
+the single patch for N and applies it; clients further behind apply the patch
+chain or fall back to the latest snapshot.
+
+A new version is only published when the catalog content actually changed.
+Only the last MAX_RETAINED_SNAPSHOTS snapshots are kept on disk; patches are
+small and kept for the whole history.
+
+Called by cleanse_course_data.py after export. Can also be run directly to
+publish the current scripts/cleaned_courses.json (e.g. after a manual fix).
+
+Usage:
+  python scripts/catalog_distribution.py
+"""
+
+import hashlib
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+CATALOG_PATH = BASE_DIR / "scripts" / "cleaned_courses.json"
+DIST_DIR = BASE_DIR / "data" / "catalog"
+MANIFEST_PATH = DIST_DIR / "manifest.json"
+
+MAX_RETAINED_SNAPSHOTS = 5
+KEY_FIELD = "Course_ID"
+
+
+# ============================================================================
+# Hashing & Files
+# ============================================================================
+
+def canonical_bytes(data):
+    """Deterministic JSON encoding used for both hashing and writing."""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def content_hash(data):
+    return hashlib.sha256(canonical_bytes(data)).hexdigest()
+
+
+def write_hashed(prefix, data):
+    """Write data to <prefix>.<sha12>.json and return (filename, sha256, size)."""
+    payload = canonical_bytes(data)
+    digest = hashlib.sha256(payload).hexdigest()
+    name = f"{prefix}.{digest[:12]}.json"
+    path = DIST_DIR / name
+    if not path.exists():
+        path.write_bytes(payload)
+    return name, digest, len(payload)
+
+
+def load_manifest():
+    if MANIFEST_PATH.exists():
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {"current_version": 0, "versions": []}
+
+
+def save_manifest(manifest):
+    DIST_DIR.mkdir(parents=True, exist_ok=True)
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def record_applied_patch(entry):
+    """Append a post-processing patch (see patch_artifacts.py) to the build metadata."""
+    manifest = load_manifest()
+    manifest.setdefault("applied_patches", []).append(entry)
+    save_manifest(manifest)
+
+
+# ============================================================================
+# Diff
+# ============================================================================
+
+def diff_records(old_records, new_records):
+    """Record-level patch from old to new, keyed by Course_ID."""
+    old = {r[KEY_FIELD]: r for r in old_records}
+    new = {r[KEY_FIELD]: r for r in new_records}
+
+    added = [new[k] for k in sorted(new.keys() - old.keys())]
+    removed = sorted(old.keys() - new.keys())
+    changed = {}
+    removed_fields = {}
+    for k in sorted(old.keys() & new.keys()):
+        before, after = old[k], new[k]
+        fields = {
+            field: after[field]
+            for field in after.keys()
+            if field not in before or before[field] != after[field]
+        }
+        if fields:
+            changed[k] = dict(sorted(fields.items()))
+        dropped = sorted(before.keys() - after.keys())
+        if dropped:
+            removed_fields[k] = dropped
+
+    return {"added": added, "removed": removed, "changed": changed, "removed_fields": removed_fields}
+
+
+def apply_patch(records, patch):
+    """Apply a patch to a list of records (the client-side operation, for verification)."""
+    by_id = {r[KEY_FIELD]: dict(r) for r in records}
+    for k in patch["removed"]:
+        by_id.pop(k, None)
+    for k, fields in patch["changed"].items():
+        by_id[k].update(fields)
+    for k, fields in patch.get("removed_fields", {}).items():
+        for field in fields:
+            by_id[k].pop(field, None)
+    for r in patch["added"]:
+        by_id[r[KEY_FIELD]] = r
+    return [by_id[k] for k in sorted(by_id)]
+
+
+# ============================================================================
+# Publish
+# ============================================================================
+
+def publish_catalog_version(records, log=print):
+    """Publish records as a new catalog version if they changed. Returns the manifest entry."""
+    DIST_DIR.mkdir(parents=True, exist_ok=True)
+    records = sorted(records, key=lambda r: r[KEY_FIELD])
+    manifest = load_manifest()
+    digest = content_hash(records)
+
+    previous = manifest["versions"][-1] if manifest["versions"] else None
+    if previous and previous["sha256"] == digest:
+        log(f"Catalog unchanged since version {previous['version']}; nothing to publish")
+        return previous
+
+    version = manifest["current_version"] + 1
+
+    # Build and verify the patch before anything is written, so a bad patch
+    # can't leave an orphan snapshot behind
+    patch = None
+    previous_path = DIST_DIR / previous["snapshot"] if previous and previous.get("snapshot") else None
+    if previous_path and previous_path.exists():
+        with open(previous_path, "r", encoding="utf-8") as f:
+            previous_records = json.load(f)
+        patch = {
+            "from_version": previous["version"],
+            "to_version": version,
+            "base_sha256": previous["sha256"],
+            "result_sha256": digest,
+            **diff_records(previous_records, records),
+        }
+        if content_hash(apply_patch(previous_records, patch)) != digest:
+            raise ValueError("Generated patch does not reproduce the new catalog")
+
+    snapshot, snapshot_sha, snapshot_size = write_hashed("catalog", records)
+    entry = {
+        "version": version,
+        "created": datetime.now().isoformat(),
+        "sha256": digest,
+        "record_count": len(records),
+        "snapshot": snapshot,
+        "snapshot_bytes": snapshot_size,
+        "patch": None,
+    }
+
+    if patch is not None:
+        name, _, size = write_hashed(f"patch.v{previous['version']}-v{version}", patch)
+        entry["patch"] = {
+            "from_version": previous["version"],
+            "file": name,
+            "bytes": size,
+            "added": len(patch["added"]),
+            "removed": len(patch["removed"]),
+            "changed": len(patch["changed"]),
+        }
+        log(f"Patch v{previous['version']} -> v{version}: +{len(patch['added'])} "
+            f"-{len(patch['removed'])} ~{len(patch['changed'])} ({size:,} bytes "
+            f"vs {snapshot_size:,} byte snapshot)")
+
+    manifest["current_version"] = version
+    manifest["current_snapshot"] = snapshot
+    manifest["versions"].append(entry)
+
+    # Drop old snapshots; patches stay so older clients can still catch up.
+    # Snapshots are content-addressed, so a catalog that returns to earlier
+    # content (A -> B -> A) shares its file with a retained version.
+    retained = {v["snapshot"] for v in manifest["versions"][-MAX_RETAINED_SNAPSHOTS:] if v.get("snapshot")}
+    for old in manifest["versions"][:-MAX_RETAINED_SNAPSHOTS]:
+        if old.get("snapshot"):
+            if old["snapshot"] not in retained:
+                (DIST_DIR / old["snapshot"]).unlink(missing_ok=True)
+            old["snapshot"] = None
+
+    save_manifest(manifest)
+
+    log(f"Published catalog version {version}: {snapshot} ({len(records)} courses)")
+    return entry
+
+
+def main():
+    with open(CATALOG_PATH, "r", encoding="utf-8") as f:
+        records = json.load(f)
+    publish_catalog_version(records)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
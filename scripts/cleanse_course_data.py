@@ -9,9 +9,19 @@ import numpy as np
 import json
 import logging
 import re
+import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
+from catalog_binary import BINARY_PATH, write_catalog_binary
+from catalog_distribution import DIST_DIR, publish_catalog_version
+from crosslist_clusters import CLUSTERS_PATH, links_from_sections, build_clusters, write_crosslist_clusters
+from occupancy_cube import CUBE_PATH, write_occupancy_cube
+from quarter_availability import (
+    INDEX_PATH as QUARTER_INDEX_PATH, section_quarter_masks, course_quarter_masks, write_quarter_index
+)
+
 # ============================================================================
 # SECTION 1: Configuration & Setup
 # ============================================================================
@@ -31,11 +41,14 @@ logger = logging.getLogger(__name__)
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "Class Data"
 OUTPUT_DIR = BASE_DIR / "scripts"
+REGISTRY_PATH = BASE_DIR / "data" / "course_registry.json"
 
 FALL_CSV = DATA_DIR / "wharton_reports_wharton-course-offerings FALL.csv"
 SPRING_CSV = DATA_DIR / "wharton_reports_wharton-course-offerings SPRING.csv"
 OUTPUT_CSV = OUTPUT_DIR / "cleaned_courses.csv"
 OUTPUT_JSON = OUTPUT_DIR / "cleaned_courses.json"
+OUTPUT_SECTIONS = OUTPUT_DIR / "cleaned_sections.json"
+OUTPUT_QUARANTINE = OUTPUT_DIR / "quarantined_sections.csv"
 REPORT_FILE = OUTPUT_DIR / "cleansing_report.txt"
 
 # Expected schema
@@ -47,18 +60,40 @@ EXPECTED_COLUMNS = [
     'Syllabi URL', '3 Yr Avg Course Rating'
 ]
 
+# Section ID = 4-letter department + 4-digit course number + 3-digit section,
+# split in a single pass (Course_ID is the department + number prefix)
+SECTION_ID_PATTERN = r'^(?P<Course_ID>(?P<Department>[A-Z]{4})\d{4})(?P<Section_Num>\d{3})$'
+
+# Section table columns (raw name -> exported name); one row per WM section
+SECTION_TABLE_COLUMNS = {
+    'Section ID': 'Section_ID',
+    'Course_ID': 'Course_ID',
+    'Section_Num': 'Section_Num',
+    'Max': 'Capacity',
+    'Instructor': 'Instructor',
+    'Meeting': 'Meeting',
+    'Location': 'Location',
+    'Part of Term': 'Part_of_Term',
+    'Status': 'Status'
+}
+
+# Low-cardinality section columns stored as integer codes into a value dictionary
+SECTION_DICT_COLUMNS = ['Term', 'Part_of_Term', 'Status', 'Location']
+
 # Validation report data
 validation_report = {
     'timestamp': datetime.now().isoformat(),
     'input_metrics': {},
     'output_metrics': {},
     'quality_checks': {},
+    'rule_results': [],
+    'quarantine': [],
     'warnings': [],
     'errors': []
 }
 
 # ============================================================================
-# SECTION 2: Data Loading & Validation
+# SECTION 2: Data Loading & Section ID Parsing
 # ============================================================================
 
 def load_csv(file_path, term_name):
@@ -100,21 +135,43 @@ def load_csv(file_path, term_name):
         validation_report['errors'].append(f"{term_name}: {str(e)}")
         raise
 
-def validate_section_id_format(df, term_name):
-    """Validate Section ID format"""
-    pattern = r'^[A-Z]{4}\d{4}\d{3}$'
-    invalid = df[~df['Section ID'].astype(str).str.match(pattern, na=False)]
+def parse_section_ids(df, term_name, source_file):
+    """Validate and split Section ID into Course_ID, Department and Section_Num in one pass.
 
+    Rows whose Section ID does not parse are moved to the quarantine table with
+    their source file and record number (1-based data record as read_csv parsed
+    it, not a physical line: blank lines are skipped and quoted fields may span
+    several lines).
+    """
+    logger.info(f"Parsing Section IDs for {term_name}")
+
+    parts = df['Section ID'].astype(str).str.extract(SECTION_ID_PATTERN)
+    valid = parts['Course_ID'].notna()
+
+    invalid = df[~valid]
     if len(invalid) > 0:
-        logger.warning(f"{term_name}: {len(invalid)} invalid Section IDs")
+        quarantined = invalid.copy()
+        quarantined.insert(0, 'Reason', np.where(
+            invalid['Section ID'].isnull(), 'Missing Section ID', 'Malformed Section ID'
+        ))
+        quarantined.insert(0, 'Record', invalid.index + 1)
+        quarantined.insert(0, 'Source_File', source_file)
+        validation_report['quarantine'].append(quarantined)
+
+        logger.warning(f"{term_name}: {len(invalid)} rows quarantined (invalid Section ID)")
         validation_report['warnings'].append(
-            f"{term_name}: {len(invalid)} rows with invalid Section ID format"
+            f"{term_name}: {len(invalid)} rows with invalid Section ID quarantined"
         )
 
+    df = df[valid].copy()
+    df[['Course_ID', 'Department', 'Section_Num']] = parts[valid]
+    validation_report['input_metrics'][f'{term_name}_quarantined'] = len(invalid)
+    logger.info(f"{term_name}: Parsed {len(df)} Section IDs ({df['Course_ID'].nunique()} unique courses)")
+
     return df
 
 # ============================================================================
-# SECTION 3: Division Filtering & Course ID Extraction
+# SECTION 3: Division Filtering
 # ============================================================================
 
 def filter_wh_division(df, term_name):
@@ -133,31 +190,6 @@ def filter_wh_division(df, term_name):
 
     return df_wm
 
-def extract_course_id(df, term_name):
-    """Extract Course ID, Department, and Section Number from Section ID"""
-    logger.info(f"Extracting Course ID from Section ID for {term_name}")
-
-    # Extract Course ID (first 8 characters: 4-letter dept + 4-digit number)
-    df['Course_ID'] = df['Section ID'].str.extract(r'^([A-Z]{4}\d{4})', expand=False)
-
-    # Extract Department (first 4 characters)
-    df['Department'] = df['Section ID'].str[:4]
-
-    # Extract Section Number (last 3 digits)
-    df['Section_Num'] = df['Section ID'].str[-3:]
-
-    # Validate extraction
-    null_course_ids = df['Course_ID'].isnull().sum()
-    if null_course_ids > 0:
-        validation_report['errors'].append(
-            f"{term_name}: {null_course_ids} rows failed Course ID extraction"
-        )
-        logger.error(f"{term_name}: Failed to extract {null_course_ids} Course IDs")
-    else:
-        logger.info(f"{term_name}: Successfully extracted {df['Course_ID'].nunique()} unique courses")
-
-    return df
-
 # ============================================================================
 # SECTION 4: Section Consolidation (Deduplication)
 # ============================================================================
@@ -203,6 +235,62 @@ def consolidate_sections(df, term_name):
 
     return df_consolidated
 
+def build_section_table(term_frames):
+    """Stack the section-level rows of every term into one table sorted by course.
+
+    consolidate_sections collapses sections into joined strings and sums; this
+    keeps them. Rows are ordered by Course_ID, then term (in the order given),
+    then section number, so all sections of a course are one contiguous slice
+    (CSR layout, see attach_section_pointers).
+    """
+    logger.info("Building section-level table")
+
+    frames = []
+    for term_name, df in term_frames:
+        sections = df[list(SECTION_TABLE_COLUMNS)].rename(columns=SECTION_TABLE_COLUMNS)
+        sections.insert(2, 'Term', term_name)
+        frames.append(sections)
+
+    table = pd.concat(frames, ignore_index=True)
+    table = table[table['Course_ID'].notna()]
+    table['Term'] = pd.Categorical(table['Term'], categories=[name for name, _ in term_frames])
+    table = table.sort_values(['Course_ID', 'Term', 'Section_Num'], kind='mergesort')
+    table['Term'] = table['Term'].astype(str)
+    table['Capacity'] = pd.to_numeric(table['Capacity'], errors='coerce')
+    table = table.reset_index(drop=True)
+    table['Quarter_Mask'] = section_quarter_masks(table['Term'], table['Part_of_Term'], table['Meeting'])
+
+    logger.info(f"Section table: {len(table)} sections for {table['Course_ID'].nunique()} courses")
+    validation_report['output_metrics']['sections'] = len(table)
+
+    return table
+
+def attach_section_pointers(df, sections):
+    """Add Section_Offset / Section_Length pointers into the section table to course records"""
+    course_ids = sections['Course_ID'].to_numpy()
+    boundaries = np.ones(len(course_ids), dtype=bool)
+    boundaries[1:] = course_ids[1:] != course_ids[:-1]
+    starts = np.flatnonzero(boundaries)
+    lengths = np.diff(np.r_[starts, len(course_ids)])
+
+    pointers = pd.DataFrame({
+        'Course_ID': course_ids[starts],
+        'Section_Offset': starts,
+        'Section_Length': lengths
+    })
+    df = df.merge(pointers, on='Course_ID', how='left')
+    df[['Section_Offset', 'Section_Length']] = df[['Section_Offset', 'Section_Length']].fillna(0).astype(int)
+
+    return df
+
+def attach_quarter_masks(df, sections):
+    """Add each course's Quarter_Mask (OR of its sections' quarter bits)"""
+    masks = course_quarter_masks(sections['Course_ID'], sections['Quarter_Mask']).rename('Quarter_Mask')
+    df = df.merge(masks, left_on='Course_ID', right_index=True, how='left')
+    df['Quarter_Mask'] = df['Quarter_Mask'].fillna(0).astype(int)
+
+    return df
+
 # ============================================================================
 # SECTION 5: Crosslist Handling
 # ============================================================================
@@ -226,6 +314,30 @@ def handle_crosslists(df, term_name):
 
     return df
 
+def resolve_crosslists(term_frames, wm_frames):
+    """Cluster crosslisted sections and courses over every term (all divisions).
+
+    Union-find over section IDs, their courses and their crosslist primaries;
+    MBA (WM) courses are preferred as each cluster's canonical Course_ID.
+    """
+    logger.info("Resolving crosslist clusters across terms")
+
+    nodes, links, primaries = links_from_sections(term_frames)
+    preferred = set(pd.concat([df['Course_ID'] for df in wm_frames]).dropna())
+    clusters = build_clusters(nodes, links, primaries, preferred)
+
+    validation_report['output_metrics']['crosslist_clusters'] = len(clusters['crosslisted'])
+    logger.info(f"{len(links)} crosslist links -> {len(clusters['crosslisted'])} clusters with 2+ courses")
+
+    return clusters
+
+def attach_crosslist_clusters(df, clusters):
+    """Add each course's Crosslist_Cluster ID and canonical Course_ID"""
+    df['Crosslist_Cluster'] = df['Course_ID'].map(clusters['id_to_cluster']).astype(int)
+    df['Crosslist_Canonical'] = df['Crosslist_Cluster'].map(lambda i: clusters['canonical'][i])
+
+    return df
+
 # ============================================================================
 # SECTION 6: Term Merging
 # ============================================================================
@@ -286,6 +398,10 @@ def merge_terms(df_fall, df_spring):
         suffixes=('', '_spring_dup')
     )
 
+    # Keep per-term CU for the cross-term consistency contract
+    merged['CU_Fall'] = merged['CU']
+    merged['CU_Spring'] = merged['CU_spring_dup']
+
     # Handle merged columns
     # Use Fall data as primary for metadata
     merged['Course Title'] = merged['Course Title'].fillna(merged.get('Course Title_spring_dup', ''))
@@ -296,13 +412,13 @@ def merge_terms(df_fall, df_spring):
     if 'Is_Crosslisted_spring_dup' in merged.columns:
         merged['Is_Crosslisted'] = merged['Is_Crosslisted'].fillna(False) | merged['Is_Crosslisted_spring_dup'].fillna(False)
 
-    # Handle Crosslist_With - combine from both terms
+    # Handle Crosslist_With - combine from both terms (each primary listed once)
     if 'Crosslist_With_spring_dup' in merged.columns:
         merged['Crosslist_With'] = merged.apply(
-            lambda row: '; '.join(filter(None, [
+            lambda row: '; '.join(dict.fromkeys(filter(None, [
                 str(row['Crosslist_With']) if pd.notna(row['Crosslist_With']) else '',
                 str(row['Crosslist_With_spring_dup']) if pd.notna(row['Crosslist_With_spring_dup']) else ''
-            ])),
+            ]))),
             axis=1
         )
 
@@ -361,53 +477,141 @@ def enrich_data(df):
 # SECTION 8: Data Validation
 # ============================================================================
 
+# Data contracts: each rule returns a boolean mask that is True for FAILING rows.
+# Rules are registered per frame ('section' = section-level rows of one term,
+# 'course' = merged course-level rows) and evaluated vectorized, in order.
+DATA_RULES = []
+
+# Row identifier column per frame, used to report failing rows
+RULE_ID_COLUMNS = {'section': 'Section ID', 'course': 'Course_ID'}
+
+# Stop the run at the first failing error-severity rule (set by --fail-fast)
+FAIL_FAST = False
+
+class DataContractError(Exception):
+    """Raised in fail-fast mode when an error-severity data contract fails"""
+
+def data_rule(name, frame, severity='error'):
+    """Register a data contract for the given frame"""
+    def register(func):
+        DATA_RULES.append({
+            'name': name,
+            'frame': frame,
+            'severity': severity,
+            'check': func
+        })
+        return func
+    return register
+
+# --- Section-level contracts -------------------------------------------------
+
+# Section ID format and Course_ID extraction are enforced upstream: parse_section_ids
+# quarantines rows that fail them, so they are reported as quarantine counts.
+
+@data_rule('Section capacity above zero', 'section', 'warning')
+def _rule_section_capacity(df):
+    return ~(pd.to_numeric(df['Max'], errors='coerce') > 0)
+
+@data_rule('CU consistent across sections', 'section', 'warning')
+def _rule_section_cu_consistent(df):
+    cu = pd.to_numeric(df['CU'], errors='coerce')
+    return cu.groupby(df['Course_ID']).transform('nunique') > 1
+
+# --- Course-level contracts --------------------------------------------------
+
+@data_rule('No duplicate Course_IDs', 'course')
+def _rule_unique_course_id(df):
+    return df['Course_ID'].duplicated(keep=False)
+
+@data_rule('All Course_IDs valid format', 'course')
+def _rule_course_id_format(df):
+    return ~df['Course_ID'].str.match(r'^[A-Z]{4}\d{4}$', na=False)
+
+@data_rule('Valid Term_Availability values', 'course')
+def _rule_term_availability(df):
+    return ~df['Term_Availability'].isin(['Fall', 'Spring', 'Both'])
+
+@data_rule('Valid CU values', 'course', 'warning')
+def _rule_cu_range(df):
+    return ~df['CU'].between(0, 2)
+
+@data_rule('No nulls in required fields', 'course')
+def _rule_required_fields(df):
+    return df[['Course_ID', 'Course Title', 'Department', 'CU']].isnull().any(axis=1)
+
+@data_rule('CU consistency across terms', 'course')
+def _rule_cu_across_terms(df):
+    cu_fall = pd.to_numeric(df['CU_Fall'], errors='coerce')
+    cu_spring = pd.to_numeric(df['CU_Spring'], errors='coerce')
+    both = df['Fall_Offered'].astype(bool) & df['Spring_Offered'].astype(bool)
+    return both & ~np.isclose(cu_fall, cu_spring, equal_nan=True)
+
+@data_rule('Term flags match section counts', 'course', 'warning')
+def _rule_term_flags(df):
+    fall = df['Fall_Offered'].astype(bool) != (df['Section_Count_Fall'] > 0)
+    spring = df['Spring_Offered'].astype(bool) != (df['Section_Count_Spring'] > 0)
+    return fall | spring
+
+@data_rule('Quarter mask matches term flags', 'course', 'warning')
+def _rule_quarter_mask(df):
+    fall = df['Fall_Offered'].astype(bool) != ((df['Quarter_Mask'] & 3) > 0)
+    spring = df['Spring_Offered'].astype(bool) != ((df['Quarter_Mask'] & 12) > 0)
+    return fall | spring
+
+@data_rule('Section pointers match section counts', 'course')
+def _rule_section_pointers(df):
+    return df['Section_Length'] != df['Section_Count_Fall'] + df['Section_Count_Spring']
+
+def run_data_rules(df, frame, label):
+    """Evaluate every registered rule for a frame; returns {rule name: passed}"""
+    checks = {}
+    id_col = RULE_ID_COLUMNS[frame]
+
+    for rule in DATA_RULES:
+        if rule['frame'] != frame:
+            continue
+
+        start = time.perf_counter()
+        mask = rule['check'](df).fillna(True).astype(bool)
+        failing = df.loc[mask, id_col].astype(str).tolist() if id_col in df.columns else \
+            [str(i) for i in df.index[mask]]
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        name = rule['name'] if frame == 'course' else f"{label}: {rule['name']}"
+        passed = len(failing) == 0
+        checks[name] = passed
+        validation_report['rule_results'].append({
+            'rule': name,
+            'frame': frame,
+            'severity': rule['severity'],
+            'failed_rows': len(failing),
+            'failing_ids': failing,
+            'elapsed_ms': elapsed_ms
+        })
+
+        if not passed:
+            message = f"{name}: {len(failing)} failing row(s)"
+            target = 'errors' if rule['severity'] == 'error' else 'warnings'
+            validation_report[target].append(message)
+            logger.log(logging.ERROR if target == 'errors' else logging.WARNING, message)
+
+            if FAIL_FAST and rule['severity'] == 'error':
+                validation_report['quality_checks'].update(checks)
+                raise DataContractError(f"Fail-fast: {message}")
+
+    validation_report['quality_checks'].update(checks)
+    return checks
+
+def validate_section_data(df, term_name):
+    """Run section-level data contracts for one term"""
+    logger.info(f"Running section-level data contracts for {term_name}")
+    return run_data_rules(df, 'section', term_name)
+
 def validate_cleaned_data(df):
-    """Run comprehensive validation checks"""
+    """Run course-level data contracts"""
     logger.info("Running validation checks")
 
-    checks = {}
-
-    # Check 1: No duplicate Course_IDs
-    duplicates = df['Course_ID'].duplicated().sum()
-    checks['No duplicate Course_IDs'] = duplicates == 0
-    if duplicates > 0:
-        validation_report['errors'].append(f"Found {duplicates} duplicate Course_IDs")
-
-    # Check 2: All Course_IDs match format
-    pattern = r'^[A-Z]{4}\d{4}$'
-    invalid_ids = df[~df['Course_ID'].str.match(pattern, na=False)]
-    checks['All Course_IDs valid format'] = len(invalid_ids) == 0
-    if len(invalid_ids) > 0:
-        validation_report['errors'].append(f"Found {len(invalid_ids)} invalid Course_ID formats")
-
-    # Check 3: Valid Term_Availability values
-    valid_terms = df['Term_Availability'].isin(['Fall', 'Spring', 'Both']).all()
-    checks['Valid Term_Availability values'] = valid_terms
-    if not valid_terms:
-        validation_report['errors'].append("Invalid Term_Availability values found")
-
-    # Check 4: Valid CU values
-    valid_cu = df['CU'].between(0, 2).all()
-    checks['Valid CU values'] = valid_cu
-    if not valid_cu:
-        validation_report['warnings'].append("Some CU values outside expected range (0-2)")
-
-    # Check 5: No nulls in required fields
-    required_fields = ['Course_ID', 'Course Title', 'Department', 'CU']
-    null_required = df[required_fields].isnull().any().any()
-    checks['No nulls in required fields'] = not null_required
-    if null_required:
-        validation_report['errors'].append("Null values found in required fields")
-
-    # Check 6: CU consistency check
-    cu_mismatches = 0
-    for idx, row in df.iterrows():
-        if row['Fall_Offered'] and row['Spring_Offered']:
-            # Would need original data to check this - skip for now
-            pass
-    checks['CU consistency across terms'] = True
-
-    validation_report['quality_checks'] = checks
+    checks = run_data_rules(df, 'course', 'Courses')
 
     # Log results
     logger.info("Validation results:")
@@ -421,61 +625,138 @@ def validate_cleaned_data(df):
 # SECTION 9: Export & Reporting
 # ============================================================================
 
+EXPORT_COLUMNS = [
+    'Course_ID', 'Course Title', 'Department', 'CU', 'Description',
+    'Prerequisites', 'Corequisites', 'Term_Availability',
+    'Instructors_Fall', 'Instructors_Spring',
+    'Section_Count_Fall', 'Section_Count_Spring',
+    'Total_Capacity', 'Meeting_Times_Fall', 'Meeting_Times_Spring',
+    'Locations_Fall', 'Locations_Spring',
+    'Average_Rating_Fall', 'Average_Rating_Spring',
+    'Is_Crosslisted', 'Crosslist_With',
+    'Course (Canvas) URL', 'Syllabi URL', 'Course_Level',
+    'Section_Offset', 'Section_Length', 'Quarter_Mask',
+    'Crosslist_Cluster', 'Crosslist_Canonical'
+]
+
+EXPORT_RENAMES = {
+    'Course Title': 'Course_Title',
+    'Course (Canvas) URL': 'Canvas_URL',
+    'Syllabi URL': 'Syllabi_URL',
+    'CU': 'Credit_Units'
+}
+
 def export_csv(df):
     """Export to CSV"""
     logger.info(f"Exporting to CSV: {OUTPUT_CSV}")
 
-    # Select and order final columns
-    final_columns = [
-        'Course_ID', 'Course Title', 'Department', 'CU', 'Description',
-        'Prerequisites', 'Corequisites', 'Term_Availability',
-        'Instructors_Fall', 'Instructors_Spring',
-        'Section_Count_Fall', 'Section_Count_Spring',
-        'Total_Capacity', 'Meeting_Times_Fall', 'Meeting_Times_Spring',
-        'Locations_Fall', 'Locations_Spring',
-        'Average_Rating_Fall', 'Average_Rating_Spring',
-        'Is_Crosslisted', 'Crosslist_With',
-        'Course (Canvas) URL', 'Syllabi URL', 'Course_Level'
-    ]
-
-    # Rename columns for final output
-    df_export = df[final_columns].copy()
-    df_export.rename(columns={
-        'Course Title': 'Course_Title',
-        'Course (Canvas) URL': 'Canvas_URL',
-        'Syllabi URL': 'Syllabi_URL',
-        'CU': 'Credit_Units'
-    }, inplace=True)
+    # Select, order and rename final columns
+    df_export = df[EXPORT_COLUMNS].rename(columns=EXPORT_RENAMES)
 
     df_export.to_csv(OUTPUT_CSV, index=False)
     logger.info(f"CSV export complete: {len(df_export)} courses")
 
-def export_json(df):
-    """Export to JSON"""
+def export_json():
+    """Export to JSON (same columns and values as the CSV; run after export_csv)"""
     logger.info(f"Exporting to JSON: {OUTPUT_JSON}")
 
-    # Convert to records format
-    records = df.to_dict('records')
-
-    # Clean up NaN values for JSON
-    for record in records:
-        for key, value in record.items():
-            if pd.isna(value):
-                record[key] = None
-            elif isinstance(value, (np.integer, np.floating)):
-                record[key] = float(value) if isinstance(value, np.floating) else int(value)
+    # Read the CSV back as strings so both artifacts carry identical records
+    records = pd.read_csv(OUTPUT_CSV, dtype=str, keep_default_na=False).to_dict('records')
 
     with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
         json.dump(records, f, indent=2, ensure_ascii=False)
 
     logger.info(f"JSON export complete: {len(records)} courses")
 
+    return records
+
+def export_quarantine():
+    """Export rows rejected during Section ID parsing (header only when none)"""
+    logger.info(f"Exporting quarantine table: {OUTPUT_QUARANTINE}")
+
+    frames = validation_report['quarantine']
+    if frames:
+        quarantine = pd.concat(frames, ignore_index=True)
+    else:
+        quarantine = pd.DataFrame(columns=['Source_File', 'Record', 'Reason'] + EXPECTED_COLUMNS)
+
+    quarantine.to_csv(OUTPUT_QUARANTINE, index=False)
+    logger.info(f"Quarantine export complete: {len(quarantine)} rows")
+
+def export_section_table(sections):
+    """Export the section table as column arrays (row i of every column is section i)"""
+    logger.info(f"Exporting section table: {OUTPUT_SECTIONS}")
+
+    columns = {}
+    dictionaries = {}
+    for col in sections.columns:
+        values = sections[col]
+        if col in SECTION_DICT_COLUMNS:
+            codes, uniques = pd.factorize(values)
+            dictionaries[col] = [str(v) for v in uniques]
+            columns[col] = [None if c < 0 else int(c) for c in codes]
+        elif col in ('Capacity', 'Quarter_Mask'):
+            columns[col] = [None if pd.isna(v) else int(v) for v in values]
+        else:
+            columns[col] = [None if pd.isna(v) else str(v) for v in values]
+
+    table = {
+        'generated': validation_report['timestamp'],
+        'row_count': len(sections),
+        'sort_order': ['Course_ID', 'Term', 'Section_Num'],
+        'columns': list(sections.columns),
+        'dictionaries': dictionaries,
+        'data': columns
+    }
+
+    with open(OUTPUT_SECTIONS, 'w', encoding='utf-8') as f:
+        json.dump(table, f, separators=(',', ':'), ensure_ascii=False)
+
+    logger.info(f"Section table export complete: {len(sections)} sections")
+
+def export_occupancy_cube(sections):
+    """Build the term x weekday x slot x department occupancy cube from the section table"""
+    logger.info(f"Building occupancy cube: {CUBE_PATH}")
+
+    summary = write_occupancy_cube(sections, 'section table', log=logger.info)
+    if summary['unparsed_meetings']:
+        validation_report['warnings'].append(
+            f"Occupancy cube: {summary['unparsed_meetings']} meeting entries could not be parsed"
+        )
+
+def export_quarter_index(df):
+    """Export course -> quarter bitmask and quarter -> course IDs index"""
+    logger.info(f"Exporting quarter availability index: {QUARTER_INDEX_PATH}")
+
+    write_quarter_index(dict(zip(df['Course_ID'], df['Quarter_Mask'])), 'section table', log=logger.info)
+
+def export_crosslist_clusters(clusters):
+    """Export every course/section ID -> crosslist cluster ID and canonical Course_IDs"""
+    logger.info(f"Exporting crosslist clusters: {CLUSTERS_PATH}")
+
+    write_crosslist_clusters(clusters, 'section table (all divisions)', log=logger.info)
+
+def export_course_lookup(records):
+    """Export the mmap course lookup file (catalog records merged with the registry)"""
+    logger.info(f"Exporting course lookup file: {BINARY_PATH}")
+
+    with open(REGISTRY_PATH, 'r', encoding='utf-8') as f:
+        registry = json.load(f)
+    write_catalog_binary(records, registry, log=logger.info)
+
+def export_catalog_version(records):
+    """Publish the exported records (cleaned_courses.json schema) as a versioned catalog build with a delta patch"""
+    logger.info(f"Publishing catalog version to {DIST_DIR}")
+
+    entry = publish_catalog_version(records, log=logger.info)
+    validation_report['output_metrics']['catalog_version'] = entry['version']
+
 def generate_report(df):
     """Generate validation report"""
     logger.info(f"Generating validation report: {REPORT_FILE}")
 
     # Calculate output metrics
-    validation_report['output_metrics'] = {
+    validation_report['output_metrics'].update({
         'unique_courses': len(df),
         'fall_only': len(df[df['Term_Availability'] == 'Fall']),
         'spring_only': len(df[df['Term_Availability'] == 'Spring']),
@@ -485,7 +766,7 @@ def generate_report(df):
         'missing_ratings_spring': df['Average_Rating_Spring'].isnull().sum(),
         'departments': df['Department'].nunique(),
         'avg_sections_per_course': df[['Section_Count_Fall', 'Section_Count_Spring']].sum(axis=1).mean()
-    }
+    })
 
     # Generate report text
     report_lines = [
@@ -507,10 +788,13 @@ def generate_report(df):
         f"Spring Only: {validation_report['output_metrics']['spring_only']}",
         f"Both Terms: {validation_report['output_metrics']['both_terms']}",
         f"Departments: {validation_report['output_metrics']['departments']}",
+        f"Sections: {validation_report['output_metrics'].get('sections', 0)}",
+        f"Catalog Version: {validation_report['output_metrics'].get('catalog_version', 'n/a')}",
         "",
         "QUALITY METRICS:",
         "-" * 80,
         f"Crosslisted Courses: {validation_report['output_metrics']['crosslisted']}",
+        f"Crosslist Clusters (2+ courses): {validation_report['output_metrics'].get('crosslist_clusters', 0)}",
         f"Missing Ratings (Fall): {validation_report['output_metrics']['missing_ratings_fall']} ({validation_report['output_metrics']['missing_ratings_fall']/len(df)*100:.1f}%)",
         f"Missing Ratings (Spring): {validation_report['output_metrics']['missing_ratings_spring']} ({validation_report['output_metrics']['missing_ratings_spring']/len(df)*100:.1f}%)",
         f"Avg Sections/Course: {validation_report['output_metrics']['avg_sections_per_course']:.1f}",
@@ -523,6 +807,33 @@ def generate_report(df):
         status = "✓ PASS" if passed else "✗ FAIL"
         report_lines.append(f"{status}: {check}")
 
+    report_lines.extend([
+        "",
+        "DATA CONTRACTS:",
+        "-" * 80
+    ])
+    for result in validation_report['rule_results']:
+        line = (f"[{result['severity']}] {result['rule']}: {result['failed_rows']} failing "
+                f"({result['elapsed_ms']:.1f} ms)")
+        if result['failing_ids']:
+            sample = ', '.join(result['failing_ids'][:5])
+            more = '...' if result['failed_rows'] > 5 else ''
+            line += f" — {sample}{more}"
+        report_lines.append(line)
+
+    quarantined = sum(len(q) for q in validation_report['quarantine'])
+    report_lines.extend([
+        "",
+        "QUARANTINE:",
+        "-" * 80,
+        f"Quarantined Rows: {quarantined} (see {OUTPUT_QUARANTINE.name})"
+    ])
+    for frame in validation_report['quarantine']:
+        for row in frame.head(10).to_dict('records'):
+            report_lines.append(f"{row['Source_File']} record {row['Record']} — {row['Reason']}: {row['Section ID']!r}")
+        if len(frame) > 10:
+            report_lines.append(f"... {len(frame) - 10} more from {frame['Source_File'].iloc[0]}")
+
     if validation_report['warnings']:
         report_lines.extend([
             "",
@@ -560,6 +871,9 @@ def generate_report(df):
 
 def main():
     """Main execution function"""
+    global FAIL_FAST
+    FAIL_FAST = '--fail-fast' in sys.argv
+
     logger.info("=" * 80)
     logger.info("STARTING COURSE DATA CLEANSING")
     logger.info("=" * 80)
@@ -570,30 +884,32 @@ def main():
         df_fall = load_csv(FALL_CSV, "Fall")
         df_spring = load_csv(SPRING_CSV, "Spring")
 
-        # Stage 2: Validate format
-        logger.info("\n--- STAGE 2: Validating Section IDs ---")
-        df_fall = validate_section_id_format(df_fall, "Fall")
-        df_spring = validate_section_id_format(df_spring, "Spring")
+        # Stage 2: Parse Section IDs (malformed rows are quarantined)
+        logger.info("\n--- STAGE 2: Parsing Section IDs ---")
+        df_fall = parse_section_ids(df_fall, "Fall", FALL_CSV.name)
+        df_spring = parse_section_ids(df_spring, "Spring", SPRING_CSV.name)
 
         # Stage 3: Filter to WM division
         logger.info("\n--- STAGE 3: Filtering to WM Division ---")
         df_fall_wm = filter_wh_division(df_fall, "Fall")
         df_spring_wm = filter_wh_division(df_spring, "Spring")
 
-        # Stage 4: Extract Course IDs
-        logger.info("\n--- STAGE 4: Extracting Course IDs ---")
-        df_fall_wm = extract_course_id(df_fall_wm, "Fall")
-        df_spring_wm = extract_course_id(df_spring_wm, "Spring")
+        # Stage 4: Section-level data contracts
+        logger.info("\n--- STAGE 4: Validating Sections ---")
+        validate_section_data(df_fall_wm, "Fall")
+        validate_section_data(df_spring_wm, "Spring")
 
         # Stage 5: Consolidate sections
         logger.info("\n--- STAGE 5: Consolidating Sections ---")
         df_fall_consolidated = consolidate_sections(df_fall_wm, "Fall")
         df_spring_consolidated = consolidate_sections(df_spring_wm, "Spring")
+        df_sections = build_section_table([("Fall", df_fall_wm), ("Spring", df_spring_wm)])
 
         # Stage 6: Handle crosslists
         logger.info("\n--- STAGE 6: Handling Crosslists ---")
         df_fall_consolidated = handle_crosslists(df_fall_consolidated, "Fall")
         df_spring_consolidated = handle_crosslists(df_spring_consolidated, "Spring")
+        crosslist_clusters = resolve_crosslists([df_fall, df_spring], [df_fall_wm, df_spring_wm])
 
         # Stage 7: Merge terms
         logger.info("\n--- STAGE 7: Merging Terms ---")
@@ -602,6 +918,9 @@ def main():
         # Stage 8: Enrich data
         logger.info("\n--- STAGE 8: Enriching Data ---")
         df_enriched = enrich_data(df_merged)
+        df_enriched = attach_section_pointers(df_enriched, df_sections)
+        df_enriched = attach_quarter_masks(df_enriched, df_sections)
+        df_enriched = attach_crosslist_clusters(df_enriched, crosslist_clusters)
 
         # Stage 9: Validate
         logger.info("\n--- STAGE 9: Validating Cleaned Data ---")
@@ -610,7 +929,14 @@ def main():
         # Stage 10: Export
         logger.info("\n--- STAGE 10: Exporting Results ---")
         export_csv(df_enriched)
-        export_json(df_enriched)
+        records = export_json()
+        export_section_table(df_sections)
+        export_quarantine()
+        export_occupancy_cube(df_sections)
+        export_quarter_index(df_enriched)
+        export_crosslist_clusters(crosslist_clusters)
+        export_course_lookup(records)
+        export_catalog_version(records)
         generate_report(df_enriched)
 
         logger.info("\n" + "=" * 80)
@@ -619,7 +945,14 @@ def main():
         logger.info(f"Output files:")
         logger.info(f"  - {OUTPUT_CSV}")
         logger.info(f"  - {OUTPUT_JSON}")
+        logger.info(f"  - {OUTPUT_SECTIONS}")
+        logger.info(f"  - {OUTPUT_QUARANTINE}")
+        logger.info(f"  - {CUBE_PATH}")
+        logger.info(f"  - {QUARTER_INDEX_PATH}")
+        logger.info(f"  - {CLUSTERS_PATH}")
+        logger.info(f"  - {BINARY_PATH}")
         logger.info(f"  - {REPORT_FILE}")
+        logger.info(f"  - {DIST_DIR}")
 
         return 0
 
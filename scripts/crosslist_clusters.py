@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Crosslist Clusters
+
+Resolves crosslisted courses into clusters of equivalent IDs, so consumers
+can ask "is this the same course?" with one integer comparison instead of
+re-parsing Crosslist_With. Crosslist_With names a primary SECTION
+("FNCE7500001"), is built per term and is '; '-joined across terms.
+
+How clusters are built:
+  A union-find over every section and course ID from every term. Each
+  section is joined to its own course (FNCE7500001 -> FNCE7500) and to its
+  crosslist primary section. So ACCT7640 and BEPP7640, which are both
+  crosslisted with BEPP2640401, end up in one cluster with BEPP2640.
+
+Canonical primary Course_ID of a cluster, in order of preference:
+  1. a course in the MBA catalog (preferred IDs)
+  2. the course named as crosslist primary most often
+  3. the lowest Course_ID
+Cluster IDs are assigned in canonical-ID order. Every catalog course has a
+cluster, even when it is not crosslisted (a cluster of one).
+
+Output: data/crosslist_clusters.json
+  canonical        canonical Course_ID per cluster ID (list index)
+  id_to_cluster    every course and section ID -> cluster ID
+  crosslisted      canonical -> member course IDs, for clusters of 2+ courses
+
+Called by cleanse_course_data.py (from every section of both terms, all
+divisions). Can also be run directly to rebuild from the catalog's
+Crosslist_With strings.
+
+Usage:
+  python scripts/crosslist_clusters.py
+"""
+
+import json
+import re
+import sys
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+CATALOG_PATH = BASE_DIR / "scripts" / "cleaned_courses.json"
+CLUSTERS_PATH = BASE_DIR / "data" / "crosslist_clusters.json"
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+COURSE_ID_PATTERN = re.compile(r"^[A-Z]{3,4}\d{4}$")
+SECTION_ID_PATTERN = re.compile(r"^(?P<course>[A-Z]{3,4}\d{4})\d{3}$")
+
+
+def normalize_id(value):
+    """'FNCE 7500 001' / 'fnce7500001' -> 'FNCE7500001'; None if it isn't a course or section ID."""
+    if value is None:
+        return None
+    text = re.sub(r"[^A-Za-z0-9]", "", str(value)).upper()
+    if COURSE_ID_PATTERN.match(text) or SECTION_ID_PATTERN.match(text):
+        return text
+    return None
+
+
+def course_of(node_id):
+    """Course ID of a section ID, or the ID itself for a course ID."""
+    match = SECTION_ID_PATTERN.match(node_id)
+    return match.group("course") if match else node_id
+
+
+# ============================================================================
+# Union-Find
+# ============================================================================
+
+class UnionFind:
+    """Disjoint sets over hashable IDs (union by size, path halving)."""
+
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+
+    def add(self, x):
+        if x not in self.parent:
+            self.parent[x] = x
+            self.size[x] = 1
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        self.add(a)
+        self.add(b)
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return ra
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        return ra
+
+    def groups(self):
+        groups = {}
+        for x in self.parent:
+            groups.setdefault(self.find(x), []).append(x)
+        return groups
+
+
+# ============================================================================
+# Links
+# ============================================================================
+
+def links_from_sections(frames):
+    """(section, primary section) links and primary counts from raw section rows.
+
+    frames: DataFrames with 'Section ID', 'Crosslist' ('P'/'S') and
+    'Crosslist Primary' columns (one per term).
+    Returns (node IDs, links, Counter of course IDs named as primary).
+    """
+    nodes, links, primaries = [], [], Counter()
+    for df in frames:
+        for section, flag, primary in zip(df["Section ID"], df["Crosslist"], df["Crosslist Primary"]):
+            section, primary = normalize_id(section), normalize_id(primary)
+            if section is None:
+                continue
+            nodes.append(section)
+            if primary is not None:
+                links.append((section, primary))
+                primaries[course_of(primary)] += 1
+            elif flag == "P":
+                primaries[course_of(section)] += 1
+    return nodes, links, primaries
+
+
+def links_from_catalog(catalog):
+    """(course, primary section) links from catalog Crosslist_With strings."""
+    nodes, links, primaries = [], [], Counter()
+    for c in catalog:
+        nodes.append(c["Course_ID"])
+        for token in (c.get("Crosslist_With") or "").split(";"):
+            primary = normalize_id(token)
+            if primary is not None:
+                links.append((c["Course_ID"], primary))
+                primaries[course_of(primary)] += 1
+    return nodes, links, primaries
+
+
+# ============================================================================
+# Clustering
+# ============================================================================
+
+def build_clusters(nodes, links, primaries=None, preferred=()):
+    """Cluster IDs with union-find and pick each cluster's canonical Course_ID.
+
+    nodes:     course / section IDs to include (each section also pulls in its course)
+    links:     (id, id) pairs that are the same course
+    primaries: Counter of course IDs named as crosslist primary
+    preferred: course IDs to favour as canonical (the MBA catalog)
+    Returns {"canonical": [...], "id_to_cluster": {...}, "crosslisted": {...}}.
+    """
+    primaries = primaries or Counter()
+    preferred = set(preferred)
+    uf = UnionFind()
+    for node in list(nodes) + list(preferred):
+        uf.add(node)
+    for a, b in links:
+        uf.union(a, b)
+    for node in list(uf.parent):
+        uf.union(node, course_of(node))
+
+    clusters = []
+    for members in uf.groups().values():
+        courses = sorted({course_of(m) for m in members})
+        canonical = min(courses, key=lambda cid: (cid not in preferred, -primaries[cid], cid))
+        clusters.append((canonical, courses, members))
+    clusters.sort()
+
+    id_to_cluster = {}
+    for cluster_id, (_, _, members) in enumerate(clusters):
+        for member in members:
+            id_to_cluster[member] = cluster_id
+    return {
+        "canonical": [canonical for canonical, _, _ in clusters],
+        "id_to_cluster": dict(sorted(id_to_cluster.items())),
+        "crosslisted": {canonical: courses for canonical, courses, _ in clusters if len(courses) > 1},
+    }
+
+
+# ============================================================================
+# Export / Load
+# ============================================================================
+
+def write_crosslist_clusters(clusters, source, log=print):
+    output = {
+        "generated": datetime.now().isoformat(),
+        "source": source,
+        "cluster_count": len(clusters["canonical"]),
+        **clusters,
+    }
+    CLUSTERS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(CLUSTERS_PATH, "w", encoding="utf-8") as f:
+        json.dump(output, f, separators=(",", ":"))
+        f.write("\n")
+
+    log(f"Crosslist clusters from {source}: {len(clusters['canonical'])} clusters over "
+        f"{len(clusters['id_to_cluster'])} IDs, {len(clusters['crosslisted'])} with 2+ courses")
+    return output
+
+
+def load_crosslist_clusters(path=CLUSTERS_PATH):
+    """The cluster file, or an empty one when it hasn't been built yet."""
+    if not Path(path).exists():
+        return {"canonical": [], "id_to_cluster": {}, "crosslisted": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    print(f"CourseHub Crosslist Clusters — {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    with open(CATALOG_PATH, "r", encoding="utf-8") as f:
+        catalog = json.load(f)
+    nodes, links, primaries = links_from_catalog(catalog)
+    clusters = build_clusters(nodes, links, primaries, preferred=nodes)
+    write_crosslist_clusters(clusters, "catalog Crosslist_With")
+    for canonical, courses in clusters["crosslisted"].items():
+        print(f"  {canonical}: {', '.join(c for c in courses if c != canonical)}")
+    print(f"\n  Wrote {CLUSTERS_PATH.relative_to(BASE_DIR)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
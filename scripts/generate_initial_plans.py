@@ -0,0 +1,595 @@
+#!/usr/bin/env python3
+"""
+Initial Plan Precomputation
+
+Precomputes a starting plan for every onboarding combination so the app can
+look one up instead of building it on the client:
+  - every single major and every compatible dual-major pair (21 majors -> 226 keys)
+  - every CU load preference (light / normal / heavy)
+  - a set of common waiver configurations (COMMON_WAIVER_SETS)
+
+Each plan starts from the same core placements as
+src/lib/scheduling/initial-plan.ts, then adds the cheapest set of offered
+electives that covers the major requirements and assigns them to quarters.
+
+How it searches:
+  1. Course selection — branch-and-bound over classes of interchangeable
+     courses (same CU, buckets, caps and terms). Partial requirement states
+     (half-CU still needed per bucket + room left per cap) are memoized, and a
+     branch is pruned when it reaches a state already reached at equal or
+     lower cost (dominated) or cannot beat the incumbent. Selections are cached
+     per (majors, core courses already in the plan) so load preferences reuse them.
+  2. Quarter assignment — backtracking over quarters under the per-quarter CU
+     limit of the load preference, term and quarter availability (half-
+     semester courses only go where they have a section that quarter) and
+     catalog prerequisites.
+  3. Placement feedback — when the cheapest selection can't all be placed,
+     selection is rerun bounded by the room the core leaves in each quarter,
+     semester and term (ROOM_REGIONS) for the quarters each course can start
+     in after its core prerequisites; room use joins the memoized state, and
+     CU limits are raised one half-CU at a time from the cheapest selection's
+     total. Each selection it completes must pass quarter assignment. Only
+     when none is found within SELECTION_NODE_BUDGET / SELECTION_CHECK_BUDGET
+     does the cheapest selection go in with its overflow in staging.
+  Core placements that alone exceed the load limit (no ACCT_FLEX waiver puts
+  2.5 CU in each Y1 spring quarter, over light's 2.0) are listed per plan in
+  "over_limit" and reported at the end of the run.
+
+Output: data/initial_plans.json, keyed by plan_key() — sorted major codes
+joined with "+", the load preference, and sorted "CORE_CODE:waiverType" pairs:
+  "FNCE+MKTG|normal|STAT_CORE:placement"
+Each plan's status is "complete" (requirements met, every course placed),
+"staged" (requirements met, but the electives listed in "unplaced" sit in
+staging) or "incomplete" (requirements listed in "unmet" can't be covered).
+
+Usage:
+  python scripts/generate_initial_plans.py
+"""
+
+import itertools
+import json
+import sys
+import time
+from datetime import datetime
+
+from reconcile import (
+    BASE_DIR, CATALOG_PATH, REGISTRY_PATH, CORE_REQ_PATH, MAJOR_REQ_PATH,
+    load_json,
+)
+from requirement_model import (
+    QUARTER_IDS, QUARTER_TERM, QUARTER_SEMESTER, SEMESTER_QUARTERS, CU_LOAD_DEFAULTS,
+    DOUBLE_COUNT_EXCLUSIONS, to_units, majors_compatible,
+    build_credit_lookup, build_crosslist_lookup, course_key, build_term_lookup, build_quarter_lookup, quarter_available,
+    build_prerequisite_lookup,
+    compile_major, core_placements, waived_core_courses,
+)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+OUTPUT_PATH = BASE_DIR / "data" / "initial_plans.json"
+
+COMMON_WAIVER_SETS = [
+    {},
+    {"STAT_CORE": "placement"},
+    {"STAT_CORE": "waiver"},
+    {"ACCT_FLEX": "waiver"},
+    {"STAT_CORE": "waiver", "ACCT_FLEX": "waiver"},
+]
+
+ASSIGNMENT_BUDGET = 20000  # max backtracking steps per plan before falling back to staging
+SELECTION_CHECK_BUDGET = 1000  # max complete selections checked by quarter assignment per plan
+SELECTION_NODE_BUDGET = 200_000  # max search nodes per bounded selection
+
+# Quarter sets whose room bounds elective selection: each quarter, semester and term, and the
+# whole plan, plus each term and the whole plan less one quarter (room some courses can't use)
+_TERM_QUARTERS = [frozenset(q for q in QUARTER_IDS if QUARTER_TERM[q] == term) for term in ("Fall", "Spring")]
+ROOM_REGIONS = (
+    [frozenset([q]) for q in QUARTER_IDS]
+    + [frozenset(quarters) for quarters in SEMESTER_QUARTERS.values()]
+    + _TERM_QUARTERS
+    + [frozenset(QUARTER_IDS)]
+    + [region - {q} for region in _TERM_QUARTERS + [frozenset(QUARTER_IDS)] for q in sorted(region)]
+)
+
+
+def plan_key(majors, load, waivers):
+    waiver_part = ",".join(f"{code}:{kind}" for code, kind in sorted(waivers.items()))
+    return f"{'+'.join(sorted(majors))}|{load}|{waiver_part}"
+
+
+# ============================================================================
+# Stage 1: Course Selection
+# ============================================================================
+
+class CourseSelector:
+    """Minimum-CU elective selection for a set of majors, memoized on requirement state."""
+
+    def __init__(self, majors_data, credit_units, terms, ratings, crosslists, quarters=None):
+        self.majors_data = majors_data
+        self.credit_units = credit_units
+        self.terms = terms
+        self.ratings = ratings
+        self.crosslists = crosslists
+        self.quarters = quarters or {}
+        self.cache = {}
+
+    def select(self, major_codes, preset, enforce_caps=True, room=None, accept=None, starts=None):
+        """Return (chosen course IDs, unmet bucket labels) for majors given courses already placed.
+
+        With enforce_caps=False, pool limits (max pillars, non-Wharton and
+        additional-course caps) are ignored. room ({quarter: half-units left
+        for electives}) bounds the selection by what the plan can hold: wherever
+        a course is placed, some of its load lands in a given quarter, semester
+        or term, and those loads must fit the room there. starts(cid) gives the
+        quarters a course can start in (by default, where it is offered).
+        accept(chosen) is called on each complete selection (e.g. "can every
+        course be placed?") and rejected ones are skipped, so the result is the
+        cheapest accepted selection. If none is found within the search
+        budgets, every bucket is reported unmet. Bounded searches are not
+        cached (they depend on the plan being built).
+        """
+        if room or accept:
+            if starts is None:
+                starts = lambda cid: placement_options(cid, self.credit_units, self.terms, self.quarters)
+            # The unconstrained optimum is also the bounded one whenever it passes
+            result = self.select(major_codes, preset, enforce_caps)
+            if result[1] or (
+                (not room or self._fits(result[0], room, starts)) and (accept is None or accept(result[0]))
+            ):
+                return result
+            floor = sum(self.credit_units.get(cid, 0) for cid in result[0])
+            return self._solve(major_codes, preset, enforce_caps, room, accept, starts, floor)
+        cache_key = (tuple(sorted(major_codes)), frozenset(preset), enforce_caps)
+        if cache_key not in self.cache:
+            self.cache[cache_key] = self._solve(major_codes, preset, enforce_caps)
+        return self.cache[cache_key]
+
+    def _region_loads(self, cid, room, starts):
+        """Least load (half-units) a course puts in each of ROOM_REGIONS, over where it fits the room."""
+        units = self.credit_units.get(cid, 0)
+        options = [quarter_charges(q, units) for q in starts(cid)]
+        options = [charges for charges in options if all(c <= room[q] for q, c in charges.items())]
+        return tuple(
+            min((sum(c for q, c in charges.items() if q in region) for charges in options), default=float("inf"))
+            for region in ROOM_REGIONS
+        )
+
+    def _fits(self, chosen, room, starts):
+        """Whether chosen courses fit the room in every region."""
+        loads = [self._region_loads(cid, room, starts) for cid in chosen]
+        return all(
+            sum(load[j] for load in loads) <= sum(room[q] for q in region)
+            for j, region in enumerate(ROOM_REGIONS)
+        )
+
+    def _solve(self, major_codes, preset, enforce_caps, room=None, accept=None, starts=None, floor=0):
+        buckets, caps = [], []
+        bucket_major, cap_major = [], []
+        for code in major_codes:
+            b, c = compile_major(self.majors_data["majors"][code])
+            # Exclusions also cover crosslisted equivalents of the listed core courses
+            excluded = {course_key(cid, self.crosslists) for cid in DOUBLE_COUNT_EXCLUSIONS.get(code, ())}
+            # Core courses already in the plan count toward buckets up front
+            for label, courses, need in b:
+                credited = sum(self.credit_units.get(cid, 0) for cid in courses & preset
+                               if course_key(cid, self.crosslists) not in excluded)
+                buckets.append((label, courses, max(0, need - credited)))
+                bucket_major.append(code)
+            for label, courses, limit in c if enforce_caps else []:
+                used = sum(self.credit_units.get(cid, 0) for cid in courses & preset)
+                caps.append((label, courses, limit - used))
+                cap_major.append(code)
+
+        classes = self._build_classes(buckets, caps, preset, bool(room))
+        needs = tuple(need for _, _, need in buckets)
+        cap_room = tuple(max(0, left) for _, _, left in caps)
+        total_limit = sum(room.values()) if room else float("inf")
+        if floor > total_limit:
+            # Even the cheapest selection overall needs more than the plan has room for
+            return [], [label for label, _, need in buckets if need > 0]
+        # Only regions the candidates could overfill constrain the search
+        # Per class: the least load any member puts in each region
+        loads = [
+            tuple(map(min, zip(*(self._region_loads(cid, room, starts) for cid in members))))
+            for _, _, _, members in classes
+        ] if room else []
+        limits = []
+        for j, region in enumerate(ROOM_REGIONS if room else ()):
+            region_room = sum(room[q] for q in region)
+            if sum(load[j] * len(c[3]) for load, c in zip(loads, classes)) > region_room:
+                limits.append((j, region_room))
+        # Per class: (limit index, load per course) for the limits it draws on
+        draws = [
+            tuple((k, load[j]) for k, (j, _) in enumerate(limits) if load[j] > 0)
+            for load in loads
+        ] if room else [()] * len(classes)
+
+        def take_courses(needs, cap_room, bucket_idx, cap_idx, spent):
+            """Apply `spent` units of a class; caps limit how much counts toward their major."""
+            counted = {}
+            for c in cap_idx:
+                major = cap_major[c]
+                counted[major] = min(counted.get(major, spent), cap_room[c])
+            new_needs = list(needs)
+            for b in bucket_idx:
+                new_needs[b] = max(0, new_needs[b] - counted.get(bucket_major[b], spent))
+            new_room = list(cap_room)
+            for c in cap_idx:
+                new_room[c] -= counted[cap_major[c]]
+            return tuple(new_needs), tuple(new_room)
+
+        def courses_of(picks):
+            chosen = []
+            for i, take in picks:
+                chosen.extend(classes[i][3][:take])
+            return chosen
+
+        best = [float("inf"), 0, None]  # cost, count, picks
+        reached = {}  # (class index, needs, cap room, room use) -> cheapest (cost, count) seen
+        checks = [0, 0]  # complete selections checked, nodes visited
+        bounded = room is not None or accept is not None
+        cost_limit = [floor if bounded else float("inf")]
+
+        def search(i, needs, cap_room, room_used, cost, count, picks):
+            if bounded:
+                checks[1] += 1
+                if best[2] is not None or checks[0] >= SELECTION_CHECK_BUDGET or checks[1] > SELECTION_NODE_BUDGET:
+                    return
+            if not any(needs):
+                if (cost, count) < (best[0], best[1]):
+                    if accept is not None:
+                        checks[0] += 1
+                        if not accept(courses_of(picks)):
+                            return
+                    best[:] = [cost, count, picks]
+                return
+            # Every unit counts at most once toward a bucket, so max(needs) is a lower bound
+            if i == len(classes) or cost + max(needs) > min(best[0], cost_limit[0]):
+                return
+            state = (i, needs, cap_room, room_used)
+            if state in reached and reached[state] <= (cost, count):
+                return  # dominated: same requirement state and room use reached no more cheaply
+            reached[state] = (cost, count)
+
+            units, bucket_idx, cap_idx, members = classes[i]
+            # Only as many as fit the room left where this class can be placed
+            most = len(members)
+            for k, load in draws[i]:
+                most = min(most, int((limits[k][1] - room_used[k]) // load))
+            options = [(needs, cap_room)]
+            for take in range(1, most + 1):
+                new_needs, new_room = take_courses(needs, cap_room, bucket_idx, cap_idx, units * take)
+                if new_needs == options[-1][0]:
+                    break  # taking more of this class no longer helps
+                options.append((new_needs, new_room))
+            # Largest take first so a good incumbent is found early
+            for take in range(len(options) - 1, -1, -1):
+                new_needs, new_room = options[take]
+                new_used = room_used
+                if take:
+                    new_used = list(room_used)
+                    for k, load in draws[i]:
+                        new_used[k] += load * take
+                    new_used = tuple(new_used)
+                search(i + 1, new_needs, new_room, new_used, cost + units * take, count + take,
+                       picks + ((i, take),) if take else picks)
+
+        if not bounded:
+            search(0, needs, cap_room, (), 0, 0, ())
+        else:
+            # Iterative deepening on CU: the first accepted selection found is the cheapest,
+            # instead of spending the budget on rejected selections cheaper than an incumbent
+            while best[2] is None and cost_limit[0] <= total_limit and checks[1] <= SELECTION_NODE_BUDGET \
+                    and checks[0] < SELECTION_CHECK_BUDGET:
+                reached.clear()
+                search(0, needs, cap_room, (0,) * len(limits), 0, 0, ())
+                cost_limit[0] += 1
+        if best[2] is None:
+            unmet = [label for label, _, need in buckets if need > 0]
+            return [], unmet
+        return courses_of(best[2]), []
+
+    def _build_classes(self, buckets, caps, preset, by_quarter=False):
+        """Group interchangeable offered courses (same CU, buckets, caps and terms).
+
+        With by_quarter, courses offered in different quarters are kept apart.
+        Returns [(units, bucket_indices, cap_indices, ranked member IDs)].
+        """
+        groups = {}
+        candidates = set().union(*(courses for _, courses, _ in buckets)) if buckets else set()
+        for cid in candidates - preset:
+            units = self.credit_units.get(cid, 0)
+            if units <= 0 or cid not in self.terms:
+                continue  # zero-CU or not currently offered
+            bucket_idx = frozenset(i for i, (_, courses, need) in enumerate(buckets)
+                                   if need > 0 and cid in courses)
+            if not bucket_idx:
+                continue
+            cap_idx = frozenset(i for i, (_, courses, _) in enumerate(caps) if cid in courses)
+            signature = (units, bucket_idx, cap_idx, frozenset(self.terms[cid]),
+                         self.quarters.get(cid) if by_quarter else None)
+            groups.setdefault(signature, []).append(cid)
+
+        classes = []
+        for (units, bucket_idx, cap_idx, _, _), members in groups.items():
+            members = sorted(members, key=lambda cid: (-self.ratings.get(cid, 0.0), cid))
+            classes.append((units, tuple(sorted(bucket_idx)), tuple(sorted(cap_idx)), members))
+        # Most broadly useful classes first so good solutions are found early
+        classes.sort(key=lambda c: (-len(c[1]), c[0], c[3][0]))
+        return classes
+
+
+# ============================================================================
+# Stage 2: Quarter Assignment
+# ============================================================================
+
+def quarter_span(quarter, units):
+    """Quarter indices a course occupies (semester-long courses span both quarters)."""
+    start = QUARTER_IDS.index(quarter)
+    return (start, start + 1) if units >= 2 else (start, start)
+
+
+def quarter_charges(quarter, units):
+    """Per-quarter load of a placement; semester-long courses split across both quarters."""
+    if units >= 2:
+        return {q: units / 2 for q in SEMESTER_QUARTERS[QUARTER_SEMESTER[quarter]]}
+    return {quarter: units}
+
+
+def core_load(core, credit_units):
+    """Half-units per quarter taken by the core placements."""
+    used = {q: 0.0 for q in QUARTER_IDS}
+    for cid, quarter in core:
+        for q, charge in quarter_charges(quarter, credit_units.get(cid, 1)).items():
+            used[q] += charge
+    return used
+
+
+def elective_room(core, load, credit_units):
+    """({quarter: half-units left for electives}, quarters the core alone puts over the load limit)."""
+    capacity = to_units(CU_LOAD_DEFAULTS[load])
+    used = core_load(core, credit_units)
+    room = {q: max(0, capacity - used[q]) for q in QUARTER_IDS}
+    return room, [q for q in QUARTER_IDS if used[q] > capacity]
+
+
+def placement_options(cid, credit_units, terms, quarters):
+    """Quarters a course can start in (semester-long courses start in the semester's first quarter)."""
+    units = credit_units.get(cid, 1)
+    options = []
+    for q in QUARTER_IDS:
+        if QUARTER_TERM[q] not in terms.get(cid, ()):
+            continue
+        if cid in quarters and not quarter_available(quarters[cid], q, units):
+            continue
+        if units >= 2 and SEMESTER_QUARTERS[QUARTER_SEMESTER[q]][0] != q:
+            continue
+        options.append(q)
+    return options
+
+
+def assign_quarters(core, electives, load, credit_units, terms, quarters, prereqs, waived):
+    """Place electives into quarters. Returns (placements dict, unplaced list)."""
+    capacity = to_units(CU_LOAD_DEFAULTS[load])
+    used = core_load(core, credit_units)
+    spans = {cid: quarter_span(quarter, credit_units.get(cid, 1)) for cid, quarter in core}
+
+    def candidate_quarters(cid):
+        return placement_options(cid, credit_units, terms, quarters)
+
+    def prereqs_met(cid, start):
+        for clause in prereqs.get(cid, []):
+            if clause & waived:
+                continue
+            if not any(p in spans and spans[p][1] < start for p in clause):
+                # Prerequisites outside the plan and catalog can't be scheduled; don't block on them
+                if any(p in spans or p in terms for p in clause):
+                    return False
+        return True
+
+    depth = {}
+
+    def prereq_depth(cid, seen=()):
+        if cid not in depth:
+            deps = [p for clause in prereqs.get(cid, []) for p in clause
+                    if p in electives and p not in seen]
+            depth[cid] = 1 + max((prereq_depth(p, seen + (cid,)) for p in deps), default=0)
+        return depth[cid]
+
+    order = sorted(electives, key=lambda c: (prereq_depth(c), len(candidate_quarters(c)), c))
+    placed = {}
+    steps = [0]
+
+    def backtrack(i):
+        if i == len(order):
+            return True
+        steps[0] += 1
+        if steps[0] > ASSIGNMENT_BUDGET:
+            return False
+        cid = order[i]
+        units = credit_units.get(cid, 1)
+        options = sorted(candidate_quarters(cid), key=lambda q: (used[q], QUARTER_IDS.index(q)))
+        for q in options:
+            charges = quarter_charges(q, units)
+            if any(used[x] + c > capacity for x, c in charges.items()):
+                continue
+            span = quarter_span(q, units)
+            if not prereqs_met(cid, span[0]):
+                continue
+            for x, c in charges.items():
+                used[x] += c
+            spans[cid] = span
+            placed[cid] = q
+            if backtrack(i + 1):
+                return True
+            for x, c in charges.items():
+                used[x] -= c
+            del spans[cid]
+            del placed[cid]
+        return False
+
+    if backtrack(0):
+        return placed, []
+
+    # Fall back: greedy placement, anything left over goes to staging
+    placed.clear()
+    unplaced = []
+    for cid in order:
+        units = credit_units.get(cid, 1)
+        for q in sorted(candidate_quarters(cid), key=lambda q: (used[q], QUARTER_IDS.index(q))):
+            charges = quarter_charges(q, units)
+            span = quarter_span(q, units)
+            if all(used[x] + c <= capacity for x, c in charges.items()) and prereqs_met(cid, span[0]):
+                for x, c in charges.items():
+                    used[x] += c
+                spans[cid] = span
+                placed[cid] = q
+                break
+        else:
+            unplaced.append(cid)
+    return placed, unplaced
+
+
+# ============================================================================
+# Selection + Assignment
+# ============================================================================
+
+def plan_electives(selector, majors, core_plan, load, credit_units, terms, quarters, prereqs, waived):
+    """Choose the cheapest electives that can all be placed, and place them.
+
+    The selection search is bounded by the room the core leaves under the load
+    limit, and each complete selection it finds is checked by quarter
+    assignment (the room bound only knows core prerequisites, and not how
+    courses pack within a region). If no selection can be placed in full, the minimum-CU
+    selection is used and the electives that don't fit go to staging.
+    Returns (chosen, unmet, placed, unplaced).
+    """
+    preset = {cid for cid, _ in core_plan}
+    room, _ = elective_room(core_plan, load, credit_units)
+    spans = {cid: quarter_span(quarter, credit_units.get(cid, 1)) for cid, quarter in core_plan}
+    assignments = {}
+
+    def starts(cid):
+        # Only core prerequisites are known up front; a clause with any course outside the core
+        # might still be met by an elective, so it doesn't restrict where this one can start
+        options = placement_options(cid, credit_units, terms, quarters)
+        for clause in prereqs.get(cid, []):
+            if not clause & waived and clause <= spans.keys():
+                end = min(spans[p][1] for p in clause)
+                options = [q for q in options if QUARTER_IDS.index(q) > end]
+        return options
+
+    def assign(chosen):
+        key = tuple(sorted(chosen))
+        if key not in assignments:
+            assignments[key] = assign_quarters(core_plan, chosen, load, credit_units, terms, quarters, prereqs, waived)
+        return assignments[key]
+
+    chosen, unmet = selector.select(majors, preset, room=room, accept=lambda c: not assign(c)[1], starts=starts)
+    if unmet:
+        chosen, unmet = selector.select(majors, preset)
+    placed, unplaced = assign(chosen)
+    return chosen, unmet, placed, unplaced
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main():
+    start = time.perf_counter()
+    print(f"CourseHub Initial Plan Precomputation — {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    catalog = load_json(CATALOG_PATH)
+    registry = load_json(REGISTRY_PATH)
+    core = load_json(CORE_REQ_PATH)
+    majors_data = load_json(MAJOR_REQ_PATH)
+
+    credit_units = build_credit_lookup(catalog, registry)
+    terms = build_term_lookup(catalog)
+    quarters = build_quarter_lookup(catalog)
+    prereqs = build_prerequisite_lookup(catalog)
+    ratings = {}
+    for c in catalog:
+        values = [float(c[f]) for f in ("Average_Rating_Fall", "Average_Rating_Spring")
+                  if c.get(f) not in (None, "")]
+        if values:
+            ratings[c["Course_ID"]] = max(values)
+
+    selector = CourseSelector(majors_data, credit_units, terms, ratings, build_crosslist_lookup(), quarters)
+
+    codes = sorted(majors_data["majors"])
+    combos = [(c,) for c in codes] + [
+        pair for pair in itertools.combinations(codes, 2) if majors_compatible(*pair)
+    ]
+
+    plans = {}
+    stats = {"complete": 0, "staged": 0, "incomplete": 0}
+    core_over_limit = {}  # (load, waiver set) -> quarters the core alone overloads
+    for waivers in COMMON_WAIVER_SETS:
+        for load in CU_LOAD_DEFAULTS:
+            _, over = elective_room(core_placements(waivers, credit_units), load, credit_units)
+            if over:
+                core_over_limit[(load, plan_key((), load, waivers).split("|")[2])] = over
+
+    for majors in combos:
+        for waivers in COMMON_WAIVER_SETS:
+            core_plan = core_placements(waivers, credit_units)
+            waived = waived_core_courses(core, waivers)
+
+            for load in CU_LOAD_DEFAULTS:
+                chosen, unmet, placed, unplaced = plan_electives(
+                    selector, majors, core_plan, load, credit_units, terms, quarters, prereqs, waived
+                )
+                _, over_limit = elective_room(core_plan, load, credit_units)
+                placements = [[cid, q] for cid, q in core_plan]
+                placements += [[cid, placed[cid]] for cid in chosen if cid in placed]
+                placements += [[cid, "staging"] for cid in unplaced]
+                placements.sort(key=lambda p: (
+                    QUARTER_IDS.index(p[1]) if p[1] in QUARTER_IDS else len(QUARTER_IDS)
+                ))
+                total_units = sum(credit_units.get(cid, 1) for cid, _ in placements)
+                status = "incomplete" if unmet else "staged" if unplaced else "complete"
+                plans[plan_key(majors, load, waivers)] = {
+                    "placements": placements,
+                    "total_cu": total_units / 2,
+                    "status": status,
+                    "unmet": unmet,
+                    "unplaced": sorted(unplaced),
+                    "over_limit": over_limit,
+                }
+                stats[status] += 1
+
+    output = {
+        "generated": datetime.now().isoformat(),
+        "key_format": "MAJOR[+MAJOR]|load|CORE_CODE:waiverType[,CORE_CODE:waiverType]",
+        "plan_count": len(plans),
+        "plans": plans,
+    }
+    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+        json.dump(output, f, separators=(",", ":"), ensure_ascii=False)
+        f.write("\n")
+
+    elapsed = time.perf_counter() - start
+    print(f"  Major combinations:     {len(combos)}")
+    print(f"  Waiver sets:            {len(COMMON_WAIVER_SETS)}")
+    print(f"  Plans written:          {len(plans)}")
+    print(f"  Complete:               {stats['complete']}")
+    print(f"  Staged (unplaced):      {stats['staged']}")
+    print(f"  Incomplete (unmet req): {stats['incomplete']}")
+    print(f"  Core over load limit:   {sum(1 for p in plans.values() if p['over_limit'])} plan(s)")
+    for (load, waiver_part), over in sorted(core_over_limit.items()):
+        print(f"    WARNING: core placements alone exceed the {load} limit "
+              f"({CU_LOAD_DEFAULTS[load]} CU) in {', '.join(over)} [waivers: {waiver_part or 'none'}]")
+    print(f"  Distinct selections:    {len(selector.cache)}")
+    print(f"  Elapsed:                {elapsed:.1f}s")
+    print(f"\n  Wrote {OUTPUT_PATH.relative_to(BASE_DIR)}")
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Dual-Major Overlap & Feasibility Matrix
+
+Answers "which second major costs the fewest extra CUs?" offline, for every
+pair of majors in wharton_mba_major_requirements.json.
+
+For each pair it computes:
+  - the minimum total major CU that satisfies BOTH majors (courses may count
+    toward both, exactly as the app validator allows)
+  - the shared courses (counting toward both majors) in that minimum selection
+  - a status: ok | constrained | infeasible | excluded
+      constrained — feasible, but pool caps (max pillars, non-Wharton /
+                    additional-course limits) raise the minimum
+      infeasible  — no course selection satisfies both majors
+      excluded    — the pair is a mutual major exclusion
+
+How it solves:
+  Course sets are integer-indexed (each course gets a bit; each major's
+  eligible set is a Python int bitmask, so overlap is `mask_a & mask_b`).
+  The minimum is a small covering integer program — integer variables per
+  class of interchangeable courses, one >= constraint per requirement bucket
+  and one <= constraint per cap — solved by the same branch-and-bound used by
+  generate_initial_plans.py (CourseSelector).
+
+Output: data/major_overlap_matrix.json — row/column order is `majors`,
+course references are indices into `courses`. Diagonal cells hold the
+single-major minimum.
+
+Usage:
+  python scripts/major_overlap_matrix.py                # all courses with known CU
+  python scripts/major_overlap_matrix.py --offered-only # only currently offered courses
+"""
+
+import json
+import sys
+import time
+from datetime import datetime
+
+from reconcile import BASE_DIR, CATALOG_PATH, REGISTRY_PATH, MAJOR_REQ_PATH, load_json
+from requirement_model import (
+    majors_compatible, build_credit_lookup, build_crosslist_lookup, build_term_lookup,
+    compile_major, major_course_ids,
+)
+from generate_initial_plans import CourseSelector
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+OUTPUT_PATH = BASE_DIR / "data" / "major_overlap_matrix.json"
+
+STATUS_CODES = {"ok": 0, "constrained": 1, "infeasible": 2, "excluded": 3}
+
+
+# ============================================================================
+# Matrix
+# ============================================================================
+
+def build_course_index(majors_data):
+    """Assign each referenced course an integer index; return (courses, {code: bitmask})."""
+    compiled = {code: compile_major(m) for code, m in majors_data["majors"].items()}
+    courses = sorted(set().union(*(major_course_ids(*c) for c in compiled.values())))
+    index = {cid: i for i, cid in enumerate(courses)}
+    masks = {}
+    for code, (buckets, caps) in compiled.items():
+        mask = 0
+        for cid in major_course_ids(buckets, caps):
+            mask |= 1 << index[cid]
+        masks[code] = mask
+    return courses, index, masks
+
+
+def solve_cell(selector, codes, credit_units):
+    """Minimum CU, chosen courses and status for one major or pair."""
+    chosen, unmet = selector.select(codes, frozenset())
+    if unmet:
+        return None, [], "infeasible"
+    total = sum(credit_units[cid] for cid in chosen)
+    relaxed, _ = selector.select(codes, frozenset(), enforce_caps=False)
+    relaxed_total = sum(credit_units[cid] for cid in relaxed)
+    return total, chosen, "constrained" if relaxed_total < total else "ok"
+
+
+def main():
+    offered_only = "--offered-only" in sys.argv
+    start = time.perf_counter()
+
+    print(f"CourseHub Dual-Major Overlap Matrix — {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Mode: {'OFFERED COURSES ONLY' if offered_only else 'ALL COURSES WITH KNOWN CU'}")
+    print()
+
+    catalog = load_json(CATALOG_PATH)
+    registry = load_json(REGISTRY_PATH)
+    majors_data = load_json(MAJOR_REQ_PATH)
+
+    credit_units = build_credit_lookup(catalog, registry)
+    if offered_only:
+        terms = build_term_lookup(catalog)
+    else:
+        # Availability doesn't matter for the CU minimum; every course is selectable
+        terms = {cid: {"Fall", "Spring"} for cid in credit_units}
+    selector = CourseSelector(majors_data, credit_units, terms, ratings={},
+                              crosslists=build_crosslist_lookup())
+
+    codes = sorted(majors_data["majors"])
+    courses, index, masks = build_course_index(majors_data)
+    n = len(codes)
+
+    min_cu = [[None] * n for _ in range(n)]
+    status = [[0] * n for _ in range(n)]
+    shared = [[[] for _ in range(n)] for _ in range(n)]
+    overlap = [[0] * n for _ in range(n)]
+
+    for i, a in enumerate(codes):
+        for j in range(i, n):
+            b = codes[j]
+            overlap[i][j] = overlap[j][i] = bin(masks[a] & masks[b]).count("1")
+            if i != j and not majors_compatible(a, b):
+                status[i][j] = status[j][i] = STATUS_CODES["excluded"]
+                continue
+            total, chosen, cell_status = solve_cell(selector, (a,) if i == j else (a, b), credit_units)
+            both = masks[a] & masks[b]
+            cell_shared = sorted(index[cid] for cid in chosen if both >> index[cid] & 1)
+            min_cu[i][j] = min_cu[j][i] = None if total is None else total / 2
+            status[i][j] = status[j][i] = STATUS_CODES[cell_status]
+            shared[i][j] = shared[j][i] = cell_shared
+
+    output = {
+        "generated": datetime.now().isoformat(),
+        "offered_only": offered_only,
+        "majors": codes,
+        "courses": courses,
+        "status_codes": STATUS_CODES,
+        "min_cu": min_cu,
+        "status": status,
+        "shared": shared,
+        "eligible_overlap": overlap,
+    }
+    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+        json.dump(output, f, separators=(",", ":"))
+        f.write("\n")
+
+    # ------------------------------------------------------------------
+    # Report: cheapest second major for each major
+    # ------------------------------------------------------------------
+    print("=" * 70)
+    print("CHEAPEST SECOND MAJOR (extra CU beyond the first major)")
+    print("=" * 70)
+    for i, a in enumerate(codes):
+        single = min_cu[i][i]
+        options = [
+            (min_cu[i][j] - single, codes[j])
+            for j in range(n)
+            if j != i and min_cu[i][j] is not None and single is not None
+        ]
+        if not options:
+            print(f"  {a}: no feasible second major")
+            continue
+        extra, b = min(options)
+        print(f"  {a} ({single:.1f} CU) + {b}: +{extra:.1f} CU "
+              f"({len(shared[i][codes.index(b)])} shared course(s))")
+
+    counts = {name: sum(status[i][j] == code for i in range(n) for j in range(i + 1, n))
+              for name, code in STATUS_CODES.items()}
+    print()
+    print("=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+    print(f"  Majors:       {n}")
+    print(f"  Pairs:        {n * (n - 1) // 2}")
+    for name, count in counts.items():
+        print(f"  {name.capitalize() + ':':<13} {count}")
+    print(f"  Elapsed:      {time.perf_counter() - start:.1f}s")
+    print(f"\n  Wrote {OUTPUT_PATH.relative_to(BASE_DIR)}")
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
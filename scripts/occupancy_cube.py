@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Time-Slot Occupancy Cube
+
+Precomputes how much MBA seat capacity (and how many sections) meet in every
+15-minute block of the week, per term and department, so the plan UI can
+overlay how busy a slot is without aggregating anything at runtime.
+
+The cube is a dense array indexed [term, weekday, slot, department]:
+  terms        Fall, Spring
+  weekdays     M T W R F S U
+  slots        15-minute blocks from DAY_START to DAY_END (07:00-23:00)
+  departments  sorted department codes (Course_ID prefix)
+
+How it is built:
+  Meeting strings ("08/25/2025 - 12/03/2025 MW 1015AM - 1144AM", several
+  joined with ';') are parsed with one vectorized regex into (section,
+  weekday, first slot, end slot) intervals. The intervals are expanded into
+  individual slots with np.repeat and accumulated with np.add.at, so there is
+  no per-section Python loop.
+
+Input: scripts/cleaned_sections.json (exact per-section capacity). If the
+section table has not been generated yet, falls back to the course catalog:
+each distinct meeting string of a term counts as one section and the course's
+Total_Capacity is split across terms by section count, then evenly across
+that term's meeting strings.
+
+Output:
+  data/occupancy_cube.bin   — raw little-endian arrays, C order:
+                              capacity (uint32) then sections (uint16)
+  data/occupancy_cube.json  — shape, axis labels, array offsets, and
+                              department-summed totals per term/weekday/slot
+
+Called by cleanse_course_data.py after export.
+
+Usage:
+  python scripts/occupancy_cube.py                 # section table if present, else catalog
+  python scripts/occupancy_cube.py --from-catalog  # force the catalog approximation
+"""
+
+import hashlib
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).parent.parent
+CATALOG_PATH = BASE_DIR / "scripts" / "cleaned_courses.json"
+SECTIONS_PATH = BASE_DIR / "scripts" / "cleaned_sections.json"
+CUBE_PATH = BASE_DIR / "data" / "occupancy_cube.bin"
+SUMMARY_PATH = BASE_DIR / "data" / "occupancy_cube.json"
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+TERMS = ["Fall", "Spring"]
+WEEKDAYS = ["M", "T", "W", "R", "F", "S", "U"]
+
+SLOT_MINUTES = 15
+DAY_START = 7 * 60
+DAY_END = 23 * 60
+SLOTS_PER_DAY = (DAY_END - DAY_START) // SLOT_MINUTES
+
+CAPACITY_DTYPE = np.dtype("<u4")
+SECTIONS_DTYPE = np.dtype("<u2")
+
+MEETING_PATTERN = (
+    r"(?P<start_date>\d{2}/\d{2}/\d{4}) - (?P<end_date>\d{2}/\d{2}/\d{4}) "
+    r"(?P<days>[MTWRFSU]+) "
+    r"(?P<start>\d{3,4})(?P<start_ampm>AM|PM) - (?P<end>\d{3,4})(?P<end_ampm>AM|PM)"
+)
+
+
+# ============================================================================
+# Inputs
+# ============================================================================
+
+def load_section_table(path=SECTIONS_PATH):
+    """Section table (see cleanse_course_data.export_section_table) as a DataFrame."""
+    with open(path, "r", encoding="utf-8") as f:
+        table = json.load(f)
+    df = pd.DataFrame(table["data"], columns=table["columns"])
+    for col, values in table["dictionaries"].items():
+        codes = df[col]
+        df[col] = [None if c is None else values[c] for c in codes]
+    return df[["Course_ID", "Term", "Capacity", "Meeting"]]
+
+
+def sections_from_catalog(catalog):
+    """Approximate section rows from course records (see module docstring)."""
+    df = pd.DataFrame(catalog)
+    counts = {t: pd.to_numeric(df[f"Section_Count_{t}"], errors="coerce").fillna(0) for t in TERMS}
+    total_sections = sum(counts.values())
+    per_section = pd.to_numeric(df["Total_Capacity"], errors="coerce").fillna(0) / total_sections.where(total_sections > 0)
+
+    frames = []
+    for term in TERMS:
+        meetings = df[f"Meeting_Times_{term}"].fillna("").str.split(";")
+        n_meetings = meetings.str.len().where(df[f"Meeting_Times_{term}"].fillna("") != "", 0)
+        term_rows = pd.DataFrame({
+            "Course_ID": df["Course_ID"],
+            "Term": term,
+            "Capacity": (per_section * counts[term] / n_meetings.where(n_meetings > 0)).fillna(0),
+            "Meeting": meetings,
+        }).explode("Meeting")
+        frames.append(term_rows[term_rows["Meeting"].str.strip() != ""])
+
+    sections = pd.concat(frames, ignore_index=True)
+    sections["Capacity"] = sections["Capacity"].round().astype(int)
+    return sections
+
+
+# ============================================================================
+# Interval Expansion
+# ============================================================================
+
+def _minutes(clock, ampm):
+    """'1015', 'AM' -> minutes after midnight (vectorized)."""
+    value = clock.astype(int).to_numpy()
+    hour = value // 100 % 12 + np.where(ampm.to_numpy() == "PM", 12, 0)
+    return hour * 60 + value % 100
+
+
+def meeting_intervals(sections):
+    """Parse meetings into one row per (section, weekday) with a [first, end) slot range.
+
+    Returns (intervals DataFrame, number of unparseable meeting entries).
+    """
+    rows = sections.assign(Meeting=sections["Meeting"].fillna("").str.split(";"))
+    rows = rows.explode("Meeting")
+    rows["Meeting"] = rows["Meeting"].str.strip()
+    rows = rows[rows["Meeting"] != ""]
+
+    parts = rows["Meeting"].str.extract(MEETING_PATTERN)
+    unparsed = int(parts["days"].isna().sum())
+    parsed = parts["days"].notna()
+    rows, parts = rows[parsed], parts[parsed]
+
+    start = _minutes(parts["start"], parts["start_ampm"])
+    end = _minutes(parts["end"], parts["end_ampm"])
+    first_slot = np.clip((start - DAY_START) // SLOT_MINUTES, 0, SLOTS_PER_DAY)
+    end_slot = np.clip(-(-(end - DAY_START) // SLOT_MINUTES), 0, SLOTS_PER_DAY)
+
+    base = pd.DataFrame({
+        "term": rows["Term"].map({t: i for i, t in enumerate(TERMS)}).to_numpy(),
+        "department": rows["Course_ID"].str[:4].to_numpy(),
+        "capacity": pd.to_numeric(rows["Capacity"], errors="coerce").fillna(0).astype(int).to_numpy(),
+        "first_slot": first_slot,
+        "end_slot": end_slot,
+    })
+
+    # One interval per meeting day: "MW" -> M and W rows
+    days = parts["days"].to_numpy().astype(str)
+    frames = []
+    for day_idx, day in enumerate(WEEKDAYS):
+        on_day = np.char.find(days, day) >= 0
+        frames.append(base[on_day].assign(weekday=day_idx))
+    intervals = pd.concat(frames, ignore_index=True)
+    intervals = intervals[intervals["term"].notna() & (intervals["end_slot"] > intervals["first_slot"])]
+    intervals["term"] = intervals["term"].astype(int)
+    return intervals, unparsed
+
+
+def build_cube(intervals, departments):
+    """Expand intervals into slots and accumulate (capacity, sections) cubes."""
+    shape = (len(TERMS), len(WEEKDAYS), SLOTS_PER_DAY, len(departments))
+    capacity = np.zeros(shape, dtype=np.int64)
+    sections = np.zeros(shape, dtype=np.int64)
+
+    lengths = (intervals["end_slot"] - intervals["first_slot"]).to_numpy()
+    owner = np.repeat(np.arange(len(intervals)), lengths)
+    # Position of each expanded slot within its interval: 0, 1, ..., length-1
+    offset = np.arange(len(owner)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+    dept_index = {d: i for i, d in enumerate(departments)}
+    index = (
+        intervals["term"].to_numpy()[owner],
+        intervals["weekday"].to_numpy()[owner],
+        intervals["first_slot"].to_numpy()[owner] + offset,
+        intervals["department"].map(dept_index).to_numpy()[owner],
+    )
+    np.add.at(capacity, index, intervals["capacity"].to_numpy()[owner])
+    np.add.at(sections, index, 1)
+
+    if capacity.max(initial=0) > np.iinfo(CAPACITY_DTYPE).max or sections.max(initial=0) > np.iinfo(SECTIONS_DTYPE).max:
+        raise ValueError("Occupancy counts overflow the export dtypes")
+    return capacity.astype(CAPACITY_DTYPE), sections.astype(SECTIONS_DTYPE)
+
+
+# ============================================================================
+# Export
+# ============================================================================
+
+def slot_labels():
+    return [f"{m // 60:02d}:{m % 60:02d}" for m in range(DAY_START, DAY_END, SLOT_MINUTES)]
+
+
+def write_occupancy_cube(sections, source, log=print):
+    """Build the cube from section rows and write the binary + JSON summary."""
+    intervals, unparsed = meeting_intervals(sections)
+    departments = sorted(intervals["department"].unique())
+    capacity, section_counts = build_cube(intervals, departments)
+
+    payload = capacity.tobytes(order="C") + section_counts.tobytes(order="C")
+    CUBE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    CUBE_PATH.write_bytes(payload)
+
+    busiest = {}
+    for t, term in enumerate(TERMS):
+        by_slot = capacity[t].sum(axis=2)
+        day, slot = np.unravel_index(by_slot.argmax(), by_slot.shape)
+        busiest[term] = {"weekday": WEEKDAYS[day], "slot": slot_labels()[slot],
+                         "capacity": int(by_slot[day, slot])}
+
+    summary = {
+        "generated": datetime.now().isoformat(),
+        "source": source,
+        "binary": CUBE_PATH.name,
+        "sha256": hashlib.sha256(payload).hexdigest(),
+        "shape": list(capacity.shape),
+        "axes": {
+            "terms": TERMS,
+            "weekdays": WEEKDAYS,
+            "slots": slot_labels(),
+            "departments": departments,
+        },
+        "slot_minutes": SLOT_MINUTES,
+        "arrays": [
+            {"name": "capacity", "dtype": CAPACITY_DTYPE.str, "offset": 0, "bytes": capacity.nbytes},
+            {"name": "sections", "dtype": SECTIONS_DTYPE.str, "offset": capacity.nbytes, "bytes": section_counts.nbytes},
+        ],
+        "intervals": len(intervals),
+        "unparsed_meetings": unparsed,
+        # Department-summed [term][weekday][slot] grids for the plan UI overlay
+        "totals": {
+            "capacity": capacity.sum(axis=3, dtype=np.int64).tolist(),
+            "sections": section_counts.sum(axis=3, dtype=np.int64).tolist(),
+        },
+        "busiest_slot": busiest,
+    }
+    with open(SUMMARY_PATH, "w", encoding="utf-8") as f:
+        json.dump(summary, f, separators=(",", ":"))
+        f.write("\n")
+
+    log(f"Occupancy cube {tuple(capacity.shape)} from {source}: {len(intervals)} meeting intervals, "
+        f"{unparsed} unparsed, {len(payload):,} bytes")
+    return summary
+
+
+def main():
+    from_catalog = "--from-catalog" in sys.argv or not SECTIONS_PATH.exists()
+
+    print(f"CourseHub Occupancy Cube — {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    if from_catalog:
+        with open(CATALOG_PATH, "r", encoding="utf-8") as f:
+            sections = sections_from_catalog(json.load(f))
+        source = "catalog (approximate per-section capacity)"
+    else:
+        sections = load_section_table()
+        source = "section table"
+
+    summary = write_occupancy_cube(sections, source)
+    for term, peak in summary["busiest_slot"].items():
+        print(f"  Busiest {term} slot: {peak['weekday']} {peak['slot']} ({peak['capacity']} seats)")
+    print(f"\n  Wrote {CUBE_PATH.relative_to(BASE_DIR)} and {SUMMARY_PATH.relative_to(BASE_DIR)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
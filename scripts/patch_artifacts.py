@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Streaming Catalog Patch Engine
+
+Applies small declarative column corrections to the exported catalog
+artifacts (cleaned_courses.csv and cleaned_courses.json) without loading
+them into pandas. Each artifact is streamed record by record in one pass with
+constant memory, written to a temp file, and only swapped in once EVERY
+artifact was patched and they agree on record count, key order and number of
+changed records.
+
+A patch is a named list of transforms (see PATCHES):
+  {"op": "prefix", "column": "Department", "source": "Course_ID", "length": 4}
+  {"op": "fill",   "column": "Corequisites", "value": ""}          # only where empty
+  {"op": "map",    "column": "Term_Availability", "mapping": {"Fa": "Fall"}}
+  {"op": "set",    "column": "Credit_Units", "value": "0.5", "where": {"Course_ID": "FNCE6210"}}
+  {"op": "strip",  "column": "Course_Title"}
+Any transform may carry a "where" dict of column == value conditions.
+
+Applied patches are recorded in the catalog build metadata
+(data/catalog/manifest.json, "applied_patches"). Run catalog_distribution.py
+afterwards to publish the patched catalog as a new version.
+
+Usage:
+  python scripts/patch_artifacts.py --list                          # Show known patches
+  python scripts/patch_artifacts.py department_from_course_id       # Apply a named patch
+  python scripts/patch_artifacts.py --patch-file my_patch.json      # Apply a patch from JSON
+  python scripts/patch_artifacts.py department_from_course_id --dry-run
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from catalog_distribution import record_applied_patch
+
+BASE_DIR = Path(__file__).parent.parent
+OUTPUT_DIR = BASE_DIR / "scripts"
+
+# ============================================================================
+# Patch Definitions
+# ============================================================================
+
+PATCHES = {
+    "department_from_course_id": {
+        "description": "Fill Department from the Course_ID prefix (first 4 characters)",
+        "transforms": [
+            {"op": "prefix", "column": "Department", "source": "Course_ID", "length": 4},
+        ],
+    },
+}
+
+
+def _apply_transform(record, transform):
+    """Apply one transform to a record in place. Returns True if the value changed."""
+    where = transform.get("where", {})
+    if any(record.get(col) != value for col, value in where.items()):
+        return False
+
+    column = transform["column"]
+    old = record.get(column)
+    op = transform["op"]
+
+    if op == "prefix":
+        new = (record.get(transform["source"]) or "")[:transform["length"]]
+    elif op == "fill":
+        new = transform["value"] if old in (None, "") else old
+    elif op == "map":
+        new = transform["mapping"].get(old, old)
+    elif op == "set":
+        new = transform["value"]
+    elif op == "strip":
+        new = old.strip() if isinstance(old, str) else old
+    else:
+        raise ValueError(f"Unknown transform op: {op}")
+
+    if new != old:
+        record[column] = new
+        return True
+    return False
+
+
+def apply_patch_to_record(record, patch):
+    changed = False
+    for transform in patch["transforms"]:
+        changed = _apply_transform(record, transform) or changed
+    return changed
+
+
+# ============================================================================
+# Artifact Formats
+# ============================================================================
+
+def iter_csv(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        yield reader.fieldnames
+        for row in reader:
+            yield row
+
+
+class CsvWriter:
+    def __init__(self, f, header):
+        self.writer = csv.DictWriter(f, fieldnames=header)
+        self.writer.writeheader()
+
+    def write(self, record):
+        self.writer.writerow(record)
+
+    def close(self):
+        pass
+
+
+def iter_json_array(path, chunk_size=1 << 16):
+    """Stream the objects of a top-level JSON array one at a time."""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf, pos = f.read(chunk_size), 0
+
+        def skip_whitespace():
+            nonlocal buf, pos
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n":
+                    pos += 1
+                if pos < len(buf):
+                    return
+                more = f.read(chunk_size)
+                if not more:
+                    raise ValueError(f"{path}: unexpected end of JSON array")
+                buf, pos = more, 0
+
+        skip_whitespace()
+        if buf[pos] != "[":
+            raise ValueError(f"{path}: expected a JSON array")
+        pos += 1
+        yield None  # no header for JSON
+
+        while True:
+            skip_whitespace()
+            if buf[pos] == "]":
+                return
+            if buf[pos] == ",":
+                pos += 1
+                continue
+            try:
+                record, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                more = f.read(chunk_size)
+                if not more:
+                    raise
+                buf, pos = buf[pos:] + more, 0
+                continue
+            yield record
+            pos = end
+            if pos > chunk_size:
+                buf, pos = buf[pos:], 0
+
+
+class JsonArrayWriter:
+    """Writes records in the same layout as json.dump(records, indent=2)."""
+
+    def __init__(self, f, header):
+        self.f = f
+        self.count = 0
+
+    def write(self, record):
+        body = json.dumps(record, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+        self.f.write(("[\n  " if self.count == 0 else ",\n  ") + body)
+        self.count += 1
+
+    def close(self):
+        self.f.write("\n]" if self.count else "[]")
+
+
+FORMATS = {
+    "csv": (iter_csv, CsvWriter),
+    "json": (iter_json_array, JsonArrayWriter),
+}
+
+# Every exported catalog artifact; all are patched together or not at all
+ARTIFACTS = [
+    ("csv", OUTPUT_DIR / "cleaned_courses.csv"),
+    ("json", OUTPUT_DIR / "cleaned_courses.json"),
+]
+
+KEY_FIELD = "Course_ID"
+
+
+# ============================================================================
+# Engine
+# ============================================================================
+
+def patch_artifact(fmt, path, patch):
+    """Stream one artifact through the patch into a temp file. Returns (temp path, stats)."""
+    reader, writer_cls = FORMATS[fmt]
+    tmp_path = path.with_name(f".{path.name}.patching")
+    keys = hashlib.sha256()
+    stats = {"records": 0, "changed": 0}
+
+    records = reader(path)
+    header = next(records)
+    with open(tmp_path, "w", encoding="utf-8", newline="") as out:
+        writer = writer_cls(out, header)
+        for record in records:
+            if apply_patch_to_record(record, patch):
+                stats["changed"] += 1
+            stats["records"] += 1
+            keys.update(str(record.get(KEY_FIELD)).encode("utf-8") + b"\0")
+            writer.write(record)
+        writer.close()
+
+    stats["key_digest"] = keys.hexdigest()
+    return tmp_path, stats
+
+
+def run_patch(name, patch, dry_run=False):
+    print(f"CourseHub Artifact Patch — {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Patch: {name} — {patch.get('description', '')}")
+    print(f"Mode: {'DRY RUN (no writes)' if dry_run else 'APPLY'}")
+    print()
+
+    results = []
+    try:
+        for fmt, path in ARTIFACTS:
+            tmp_path, stats = patch_artifact(fmt, path, patch)
+            results.append((path, tmp_path, stats))
+            print(f"  {path.name:<24} {stats['records']} records, {stats['changed']} changed")
+
+        # Artifacts must describe the same records in the same order
+        reference = results[0][2]
+        for path, _, stats in results[1:]:
+            for field in ("records", "changed", "key_digest"):
+                if stats[field] != reference[field]:
+                    raise ValueError(
+                        f"{path.name} is out of sync with {results[0][0].name} ({field} differs); "
+                        "no artifact was modified"
+                    )
+    except Exception:
+        for _, tmp_path, _ in results:
+            tmp_path.unlink(missing_ok=True)
+        raise
+
+    if dry_run:
+        for _, tmp_path, _ in results:
+            tmp_path.unlink(missing_ok=True)
+        print("\n  Dry run: no artifacts modified.\n")
+        return 0
+
+    for path, tmp_path, _ in results:
+        os.replace(tmp_path, path)
+
+    record_applied_patch({
+        "name": name,
+        "description": patch.get("description", ""),
+        "transforms": patch["transforms"],
+        "applied_at": datetime.now().isoformat(),
+        "records_changed": reference["changed"],
+        "artifacts": [path.name for path, _, _ in results],
+    })
+    print(f"\n  Applied to {len(results)} artifact(s); recorded in build metadata.")
+    print("  Run python scripts/catalog_distribution.py to publish the patched catalog.\n")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply a declarative patch to the exported catalog artifacts.")
+    parser.add_argument("patch", nargs="?", help=f"Named patch to apply ({', '.join(PATCHES)})")
+    parser.add_argument("--patch-file", type=Path, metavar="PATH", help="Apply a patch from a JSON file")
+    parser.add_argument("--dry-run", action="store_true", help="Patch into temp files and report, without swapping them in")
+    parser.add_argument("--list", action="store_true", help="Show known patches")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, patch in PATCHES.items():
+            print(f"  {name}: {patch['description']}")
+        return 0
+
+    if args.patch_file:
+        if args.patch:
+            parser.error("give either a patch name or --patch-file, not both")
+        with open(args.patch_file, "r", encoding="utf-8") as f:
+            patch = json.load(f)
+        return run_patch(patch.get("name", args.patch_file.stem), patch, args.dry_run)
+
+    if args.patch not in PATCHES:
+        print(f"Unknown or missing patch. Known patches: {', '.join(PATCHES)}")
+        return 2
+    return run_patch(args.patch, PATCHES[args.patch], args.dry_run)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Quarter-Level Availability
+
+Derives which half-semester quarters each section and course meets in, so
+the plan grid and the initial-plan builder can check a placement with one bit
+test instead of guessing from Term_Availability ("Fall" / "Spring" / "Both").
+
+Bits (QUARTER_BITS):
+  1  Fall Q1     (Y1F_Q1, Y2F_Q5)
+  2  Fall Q2     (Y1F_Q2, Y2F_Q6)
+  4  Spring Q1   (Y1S_Q3, Y2S_Q7)
+  8  Spring Q2   (Y1S_Q4, Y2S_Q8)
+A full-semester section sets both bits of its term; a course's mask is the OR
+of its sections' masks.
+
+How a section's quarters are derived (vectorized over all sections):
+  1. Part of Term, when it names the first/second quarter or the full term
+  2. otherwise the meeting date ranges: a meeting covers the first half if it
+     starts before the term midpoint and the second half if it ends after it
+     (midpoint = middle of that term's overall meeting date span)
+  3. otherwise (no usable meeting dates) the full term
+
+Output: data/quarter_index.json — bit definitions, QuarterId -> bit,
+course -> mask, and quarter -> course IDs.
+
+Called by cleanse_course_data.py after export. Can also be run directly to
+rebuild the index from the catalog's Meeting_Times_* (dates only; the catalog
+has no Part of Term).
+
+Usage:
+  python scripts/quarter_availability.py
+"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).parent.parent
+CATALOG_PATH = BASE_DIR / "scripts" / "cleaned_courses.json"
+INDEX_PATH = BASE_DIR / "data" / "quarter_index.json"
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+QUARTER_BITS = {"Fall_Q1": 1, "Fall_Q2": 2, "Spring_Q1": 4, "Spring_Q2": 8}
+TERM_QUARTER_BITS = {"Fall": (1, 2), "Spring": (4, 8)}  # (first half, second half)
+
+# Plan grid quarters (src/types/plan.ts) -> availability bit
+QUARTER_ID_BITS = {
+    "Y1F_Q1": 1, "Y1F_Q2": 2, "Y1S_Q3": 4, "Y1S_Q4": 8,
+    "Y2F_Q5": 1, "Y2F_Q6": 2, "Y2S_Q7": 4, "Y2S_Q8": 8,
+}
+
+# Part of Term values (case-insensitive) -> which half of the term
+PART_OF_TERM_PATTERNS = {
+    "first": r"first|1st|\bq[13]\b",
+    "second": r"second|2nd|\bq[24]\b",
+    "full": r"full|semester",
+}
+
+DATE_RANGE_PATTERN = r"(?P<start>\d{2}/\d{2}/\d{4}) - (?P<end>\d{2}/\d{2}/\d{4})"
+
+
+# ============================================================================
+# Derivation
+# ============================================================================
+
+def section_quarter_masks(term, part_of_term, meeting):
+    """Quarter bitmask per section from aligned Term / Part of Term / Meeting series."""
+    index = term.index
+    first_bit = term.map(lambda t: TERM_QUARTER_BITS.get(t, (0, 0))[0]).astype(int)
+    second_bit = term.map(lambda t: TERM_QUARTER_BITS.get(t, (0, 0))[1]).astype(int)
+
+    # 2. Meeting dates: one row per meeting entry, then any() back per section
+    meetings = meeting.fillna("").astype(str).str.split(";").explode()
+    dates = meetings.str.extract(DATE_RANGE_PATTERN)
+    start = pd.to_datetime(dates["start"], format="%m/%d/%Y", errors="coerce")
+    end = pd.to_datetime(dates["end"], format="%m/%d/%Y", errors="coerce")
+    meeting_term = term.reindex(meetings.index).to_numpy()
+    span_start = start.groupby(meeting_term).transform("min")
+    span_end = end.groupby(meeting_term).transform("max")
+    midpoint = span_start + (span_end - span_start) / 2
+    dated = start.notna() & end.notna()
+    in_first = (dated & (start < midpoint)).groupby(level=0).any().reindex(index, fill_value=False)
+    in_second = (dated & (end > midpoint)).groupby(level=0).any().reindex(index, fill_value=False)
+    has_dates = dated.groupby(level=0).any().reindex(index, fill_value=False)
+
+    # 1. Part of Term overrides dates when it is recognisable
+    part = part_of_term.fillna("").astype(str).str.lower()
+    named_first = part.str.contains(PART_OF_TERM_PATTERNS["first"], regex=True)
+    named_second = part.str.contains(PART_OF_TERM_PATTERNS["second"], regex=True)
+    named_full = part.str.contains(PART_OF_TERM_PATTERNS["full"], regex=True)
+    named = named_first | named_second | named_full
+
+    # 3. Neither: assume the full term
+    use_first = np.where(named, named_first | named_full, np.where(has_dates, in_first, True))
+    use_second = np.where(named, named_second | named_full, np.where(has_dates, in_second, True))
+
+    return pd.Series(use_first * first_bit.to_numpy() + use_second * second_bit.to_numpy(),
+                     index=index, dtype=int)
+
+
+def course_quarter_masks(course_ids, masks):
+    """OR section masks per course; returns a Series indexed by Course_ID."""
+    combined = 0
+    for bit in QUARTER_BITS.values():
+        combined = combined + ((masks & bit) > 0).groupby(course_ids).any().astype(int) * bit
+    return combined
+
+
+def catalog_quarter_masks(catalog):
+    """Course ID -> mask from catalog Meeting_Times_* (each meeting string treated as a section)."""
+    df = pd.DataFrame(catalog)
+    frames = []
+    for term in TERM_QUARTER_BITS:
+        meetings = df[f"Meeting_Times_{term}"].fillna("")
+        offered = meetings != ""
+        frames.append(pd.DataFrame({
+            "Course_ID": df.loc[offered, "Course_ID"],
+            "Term": term,
+            "Meeting": meetings[offered],
+        }))
+    rows = pd.concat(frames, ignore_index=True)
+    masks = section_quarter_masks(rows["Term"], pd.Series(None, index=rows.index, dtype=object), rows["Meeting"])
+    return course_quarter_masks(rows["Course_ID"], masks).to_dict()
+
+
+# ============================================================================
+# Export
+# ============================================================================
+
+def write_quarter_index(course_masks, source, log=print):
+    """Write course -> mask and quarter -> course IDs to INDEX_PATH."""
+    course_masks = {cid: int(mask) for cid, mask in sorted(course_masks.items())}
+    index = {
+        "generated": datetime.now().isoformat(),
+        "source": source,
+        "bits": QUARTER_BITS,
+        "quarter_ids": QUARTER_ID_BITS,
+        "courses": course_masks,
+        "by_quarter": {
+            name: [cid for cid, mask in course_masks.items() if mask & bit]
+            for name, bit in QUARTER_BITS.items()
+        },
+    }
+    INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(INDEX_PATH, "w", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"))
+        f.write("\n")
+
+    counts = ", ".join(f"{name} {len(ids)}" for name, ids in index["by_quarter"].items())
+    log(f"Quarter index from {source}: {len(course_masks)} courses ({counts})")
+    return index
+
+
+def main():
+    print(f"CourseHub Quarter Availability — {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    with open(CATALOG_PATH, "r", encoding="utf-8") as f:
+        catalog = json.load(f)
+    write_quarter_index(catalog_quarter_masks(catalog), "catalog meeting dates")
+    print(f"\n  Wrote {INDEX_PATH.relative_to(BASE_DIR)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
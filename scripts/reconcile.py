@@ -16,18 +16,40 @@ What it does:
   - Detects NEW course IDs in requirements that aren't in the registry
   - Detects courses in the registry that are no longer referenced by any requirement
   - Flags credit unit mismatches between catalog and registry
+  - Proposes likely renumbered/renamed course pairs with confidence scores
+  - With --apply, rebuilds the mmap course lookup file (data/course_lookup.bin)
+    from the updated registry
+  - Builds the substitution index (core -> eligible substitution courses and
+    course -> cores, from a prefix trie over catalog + registry IDs); with
+    --apply, writes it to data/substitution_index.json
   - Prints a clear report of what changed and what needs manual attention
 
+Several cohorts (each with its own core + majors requirement versions) are
+reconciled in one pass: the catalog and registry are indexed once, the
+catalog-vs-registry checks run once, and the requirement checks run per
+cohort. The report ends with a merged registry update: IDs any cohort needs,
+entries orphaned by every cohort, and conflicts between cohorts. Cohort
+bundles are listed in Student Requirements/cohorts.json:
+
+  {"cohorts": [{"cohort": "Class of 2027",
+                "core": "wharton_mba_core_requirements.json",
+                "majors": "wharton_mba_major_requirements.json"}]}
+
 Usage:
-  python scripts/reconcile.py           # Report only (no changes)
-  python scripts/reconcile.py --apply   # Apply changes to registry
+  python scripts/reconcile.py                       # Report only (no changes)
+  python scripts/reconcile.py --apply               # Apply changes to registry
+  python scripts/reconcile.py --cohorts other.json  # Use a different cohort list
 """
 
+import argparse
 import json
+import re
 import sys
 from pathlib import Path
 from datetime import datetime
 
+from crosslist_clusters import load_crosslist_clusters
+
 # ============================================================================
 # Configuration
 # ============================================================================
@@ -37,9 +59,18 @@ CATALOG_PATH = BASE_DIR / "scripts" / "cleaned_courses.json"
 REGISTRY_PATH = BASE_DIR / "data" / "course_registry.json"
 CORE_REQ_PATH = BASE_DIR / "Student Requirements" / "wharton_mba_core_requirements.json"
 MAJOR_REQ_PATH = BASE_DIR / "Student Requirements" / "wharton_mba_major_requirements.json"
+COHORTS_PATH = BASE_DIR / "Student Requirements" / "cohorts.json"
+SUBSTITUTION_INDEX_PATH = BASE_DIR / "data" / "substitution_index.json"
 
 WHARTON_DEPTS = {"ACCT", "BEPP", "FNCE", "HCMG", "LGST", "MGMT", "MKTG", "OIDD", "REAL", "STAT", "WHCP"}
 
+# Renumber/rename matching (section 6)
+MATCH_MIN_CONFIDENCE = 0.45   # pairs scoring below this are not reported
+MATCH_MAX_PER_COURSE = 3      # best N candidates reported per unmatched course
+MATCH_MAX_BLOCK_SIZE = 200    # blocking keys shared by more courses than this are too common to be useful
+MATCH_WEIGHTS = {"title": 0.45, "description": 0.2, "id": 0.35}
+MATCH_ID_ONLY_DISCOUNT = 0.6  # confidence multiplier when neither course has a title/description
+
 
 # ============================================================================
 # Data Loading
@@ -56,6 +87,16 @@ def save_json(path, data):
         f.write("\n")
 
 
+def parse_credit_units(value):
+    """Catalog credit units may be serialized as strings ("0.5"); coerce to float."""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
 def extract_requirement_ids(core, majors):
     """Extract all unique course IDs referenced in requirements files."""
     ids = set()
@@ -101,31 +142,175 @@ def build_course_to_majors(majors):
     return mapping
 
 
+# ============================================================================
+# Renumber / Rename Matching
+# ============================================================================
+
+def normalize_title(title):
+    """Lowercase, strip punctuation and collapse whitespace for n-gram comparison."""
+    return " ".join(re.sub(r"[^a-z0-9 ]", " ", (title or "").lower()).split())
+
+
+def char_ngrams(text, n=3):
+    """Character n-grams of a normalized string, padded so short words still block."""
+    padded = f" {text} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)} if text else set()
+
+
+def word_set(text):
+    return {w for w in normalize_title(text).split() if len(w) > 3}
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return None
+    return len(a & b) / len(a | b)
+
+
+def id_proximity(a, b):
+    """Score department + number closeness of two course IDs (0..1)."""
+    dept_a, num_a = a[:4], a[4:]
+    dept_b, num_b = b[:4], b[4:]
+    if not (num_a.isdigit() and num_b.isdigit()):
+        return 0.0
+    if num_a == num_b:
+        return 0.9  # same number, different department (e.g. STAT5810 / OIDD5810)
+    if dept_a != dept_b:
+        return 0.0
+    if num_a[0] != num_b[0]:
+        return 0.2  # same department, different level
+    return max(0.3, 1.0 - abs(int(num_a) - int(num_b)) / 300)
+
+
+def build_match_records(catalog_lookup, registry_lookup, ids):
+    """Title / description / blocking keys for each course ID that can take part in matching."""
+    records = {}
+    for cid in ids:
+        cat = catalog_lookup.get(cid, {})
+        reg = registry_lookup.get(cid, {})
+        title = normalize_title(cat.get("Course_Title") or reg.get("course_title"))
+        grams = char_ngrams(title)
+        keys = {f"t:{g}" for g in grams}
+        keys.add(f"n:{cid[4:]}")
+        keys.add(f"d:{cid[:5]}")
+        records[cid] = {
+            "grams": grams,
+            "words": word_set(cat.get("Description")),
+            "keys": keys,
+        }
+    return records
+
+
+def find_renumber_candidates(catalog_lookup, registry_lookup, unmatched_ids):
+    """Propose likely renumber/rename pairs for unmatched course IDs.
+
+    Unmatched IDs (orphaned registry entries and requirement IDs missing from the
+    registry) are compared against each other and against catalog courses. An
+    inverted index over title trigrams, course number and department+level keeps
+    the comparison to pairs that share at least one blocking key. A pair of two
+    unmatched IDs is scored once, from the lower ID.
+    Returns a list of (unmatched_id, candidate_id, confidence, signals) sorted by
+    confidence descending.
+    """
+    unmatched = set(unmatched_ids)
+    pool = unmatched | set(catalog_lookup)
+    records = build_match_records(catalog_lookup, registry_lookup, pool)
+
+    index = {}
+    for cid, rec in records.items():
+        for key in rec["keys"]:
+            index.setdefault(key, []).append(cid)
+
+    results = []
+    for cid in sorted(unmatched):
+        rec = records[cid]
+        candidates = set()
+        for key in rec["keys"]:
+            block = index[key]
+            if len(block) <= MATCH_MAX_BLOCK_SIZE:
+                candidates.update(other for other in block if other not in unmatched or cid < other)
+
+        scored = []
+        for other in candidates:
+            signals = {
+                "title": jaccard(rec["grams"], records[other]["grams"]),
+                "description": jaccard(rec["words"], records[other]["words"]),
+                "id": id_proximity(cid, other),
+            }
+            available = {k: v for k, v in signals.items() if v is not None}
+            weight = sum(MATCH_WEIGHTS[k] for k in available)
+            confidence = sum(MATCH_WEIGHTS[k] * v for k, v in available.items()) / weight
+            if len(available) == 1:
+                confidence *= MATCH_ID_ONLY_DISCOUNT
+            if confidence >= MATCH_MIN_CONFIDENCE:
+                scored.append((cid, other, confidence, signals))
+
+        scored.sort(key=lambda m: (-m[2], m[1]))
+        results.extend(scored[:MATCH_MAX_PER_COURSE])
+
+    results.sort(key=lambda m: (-m[2], m[0], m[1]))
+    return results
+
+
 # ============================================================================
 # Reconciliation Checks
 # ============================================================================
 
-def reconcile(catalog, registry, req_ids, course_to_majors):
-    """Run all reconciliation checks. Returns changes dict and report lines."""
+def build_lookups(catalog, registry, crosslists=None):
+    """Index catalog and registry by course ID. Built once and shared by every cohort.
 
+    crosslists: crosslist cluster file (crosslist_clusters.py); loaded from disk when None.
+    """
     catalog_lookup = {c["Course_ID"]: c for c in catalog}
-    catalog_ids = set(catalog_lookup.keys())
     registry_lookup = {r["course_id"]: r for r in registry}
-    registry_ids = set(registry_lookup.keys())
+    id_to_cluster = (crosslists or load_crosslist_clusters())["id_to_cluster"]
+    cluster_courses = {}
+    for cid, cluster in id_to_cluster.items():
+        if len(cid) <= 8:  # course IDs only, not section IDs
+            cluster_courses.setdefault(cluster, []).append(cid)
+    return {
+        "catalog": catalog_lookup,
+        "catalog_ids": set(catalog_lookup.keys()),
+        "registry": registry_lookup,
+        "registry_ids": set(registry_lookup.keys()),
+        "crosslist_cluster": id_to_cluster,
+        "cluster_courses": cluster_courses,
+    }
+
+
+def crosslisted_equivalents(lookups, cid, ids):
+    """Other course IDs in cid's crosslist cluster that are also in ids."""
+    cluster = lookups["crosslist_cluster"].get(cid)
+    if cluster is None:
+        return []
+    return sorted(c for c in lookups["cluster_courses"][cluster] if c != cid and c in ids)
+
+
+def section_header(title):
+    return ["=" * 70, title, "=" * 70]
+
+
+def registry_checks(registry, lookups):
+    """Catalog vs registry checks (sections 1, 4, 5). Independent of requirements.
+
+    Returns the auto-fixable changes dict and {section number: report lines}.
+    """
+    catalog_lookup = lookups["catalog"]
+    catalog_ids = lookups["catalog_ids"]
+    registry_lookup = lookups["registry"]
+    registry_ids = lookups["registry_ids"]
 
     changes = {
         "offered_updates": [],      # registry entries where currently_offered changed
         "credit_updates": [],       # registry entries where credit_units changed vs catalog
         "catalog_title_updates": [], # registry entries where title changed vs catalog
     }
-    report = []
+    sections = {}
 
     # ------------------------------------------------------------------
     # 1. Update currently_offered flags
     # ------------------------------------------------------------------
-    report.append("=" * 70)
-    report.append("1. CURRENTLY_OFFERED FLAG UPDATES")
-    report.append("=" * 70)
+    report = sections[1] = section_header("1. CURRENTLY_OFFERED FLAG UPDATES")
 
     newly_offered = []
     no_longer_offered = []
@@ -149,65 +334,20 @@ def reconcile(catalog, registry, req_ids, course_to_majors):
     if no_longer_offered:
         report.append(f"\n  No longer offered ({len(no_longer_offered)}):")
         for cid in sorted(no_longer_offered):
-            report.append(f"    - {cid} (was offered, no longer in catalog)")
+            equivalents = crosslisted_equivalents(lookups, cid, catalog_ids)
+            offered_as = f"; crosslisted as {', '.join(equivalents)}" if equivalents else ""
+            report.append(f"    - {cid} (was offered, no longer in catalog{offered_as})")
     if not newly_offered and not no_longer_offered:
         report.append("  No changes needed.")
 
-    # ------------------------------------------------------------------
-    # 2. New requirement IDs not in registry
-    # ------------------------------------------------------------------
-    report.append("")
-    report.append("=" * 70)
-    report.append("2. NEW REQUIREMENT COURSE IDs NOT IN REGISTRY")
-    report.append("=" * 70)
-
-    new_req_ids = req_ids - registry_ids
-    if new_req_ids:
-        report.append(f"\n  {len(new_req_ids)} course(s) in requirements but NOT in registry:")
-        report.append("  These need to be added manually to data/course_registry.json")
-        report.append("")
-        for cid in sorted(new_req_ids):
-            dept = cid[:4]
-            is_wharton = dept in WHARTON_DEPTS
-            in_catalog = cid in catalog_ids
-            used_by = ", ".join(sorted(set(course_to_majors.get(cid, []))))
-            label = "Wharton" if is_wharton else "non-Wharton"
-            offered = " (currently offered)" if in_catalog else ""
-            report.append(f"    {cid} [{label}]{offered} — used by: {used_by}")
-    else:
-        report.append("  All requirement course IDs are in the registry. No action needed.")
-
-    # ------------------------------------------------------------------
-    # 3. Orphaned registry entries (no longer in any requirement)
-    # ------------------------------------------------------------------
-    report.append("")
-    report.append("=" * 70)
-    report.append("3. ORPHANED REGISTRY ENTRIES")
-    report.append("=" * 70)
-
-    orphaned = registry_ids - req_ids
-    if orphaned:
-        report.append(f"\n  {len(orphaned)} course(s) in registry but NOT referenced by any requirement:")
-        report.append("  These may be safe to remove, or may be needed for other purposes.")
-        report.append("")
-        for cid in sorted(orphaned):
-            r = registry_lookup[cid]
-            offered = "offered" if r.get("currently_offered") else "not offered"
-            report.append(f"    {cid} ({r.get('course_title', '?')}) [{offered}]")
-    else:
-        report.append("  No orphaned entries. All registry courses are referenced by requirements.")
-
     # ------------------------------------------------------------------
     # 4. Credit unit mismatches (catalog vs registry)
     # ------------------------------------------------------------------
-    report.append("")
-    report.append("=" * 70)
-    report.append("4. CREDIT UNIT MISMATCHES (catalog vs registry)")
-    report.append("=" * 70)
+    report = sections[4] = section_header("4. CREDIT UNIT MISMATCHES (catalog vs registry)")
 
     mismatches = []
     for cid in sorted(catalog_ids & registry_ids):
-        cat_cu = catalog_lookup[cid].get("Credit_Units")
+        cat_cu = parse_credit_units(catalog_lookup[cid].get("Credit_Units"))
         reg_cu = registry_lookup[cid].get("credit_units")
         if cat_cu is not None and reg_cu is not None and abs(cat_cu - reg_cu) > 0.001:
             mismatches.append((cid, reg_cu, cat_cu))
@@ -223,10 +363,7 @@ def reconcile(catalog, registry, req_ids, course_to_majors):
     # ------------------------------------------------------------------
     # 5. Title drift (catalog title differs from registry)
     # ------------------------------------------------------------------
-    report.append("")
-    report.append("=" * 70)
-    report.append("5. TITLE DIFFERENCES (catalog vs registry)")
-    report.append("=" * 70)
+    report = sections[5] = section_header("5. TITLE DIFFERENCES (catalog vs registry)")
 
     title_diffs = []
     for cid in sorted(catalog_ids & registry_ids):
@@ -247,30 +384,346 @@ def reconcile(catalog, registry, req_ids, course_to_majors):
     else:
         report.append("  No title differences between catalog and registry.")
 
+    return changes, sections
+
+
+def requirement_checks(lookups, req_ids, course_to_majors):
+    """Requirements vs registry checks (sections 2, 3, 6) for one set of requirements.
+
+    Returns a result dict (new_req_ids, orphaned, matches) and {section number: report lines}.
+    """
+    catalog_ids = lookups["catalog_ids"]
+    registry_lookup = lookups["registry"]
+    registry_ids = lookups["registry_ids"]
+    sections = {}
+
     # ------------------------------------------------------------------
-    # Summary
+    # 2. New requirement IDs not in registry
     # ------------------------------------------------------------------
-    report.append("")
-    report.append("=" * 70)
-    report.append("SUMMARY")
-    report.append("=" * 70)
+    report = sections[2] = section_header("2. NEW REQUIREMENT COURSE IDs NOT IN REGISTRY")
 
-    total_changes = (
+    new_req_ids = req_ids - registry_ids
+    if new_req_ids:
+        report.append(f"\n  {len(new_req_ids)} course(s) in requirements but NOT in registry:")
+        report.append("  These need to be added manually to data/course_registry.json")
+        report.append("")
+        for cid in sorted(new_req_ids):
+            dept = cid[:4]
+            is_wharton = dept in WHARTON_DEPTS
+            in_catalog = cid in catalog_ids
+            used_by = ", ".join(sorted(set(course_to_majors.get(cid, []))))
+            label = "Wharton" if is_wharton else "non-Wharton"
+            offered = " (currently offered)" if in_catalog else ""
+            equivalents = crosslisted_equivalents(lookups, cid, registry_ids)
+            if equivalents:
+                offered += f" (crosslisted with registry {', '.join(equivalents)})"
+            report.append(f"    {cid} [{label}]{offered} — used by: {used_by}")
+    else:
+        report.append("  All requirement course IDs are in the registry. No action needed.")
+
+    # ------------------------------------------------------------------
+    # 3. Orphaned registry entries (no longer in any requirement)
+    # ------------------------------------------------------------------
+    report = sections[3] = section_header("3. ORPHANED REGISTRY ENTRIES")
+
+    orphaned = registry_ids - req_ids
+    if orphaned:
+        report.append(f"\n  {len(orphaned)} course(s) in registry but NOT referenced by any requirement:")
+        report.append("  These may be safe to remove, or may be needed for other purposes.")
+        report.append("")
+        for cid in sorted(orphaned):
+            r = registry_lookup[cid]
+            offered = "offered" if r.get("currently_offered") else "not offered"
+            report.append(f"    {cid} ({r.get('course_title', '?')}) [{offered}]")
+    else:
+        report.append("  No orphaned entries. All registry courses are referenced by requirements.")
+
+    # ------------------------------------------------------------------
+    # 6. Likely renumbered / renamed courses
+    # ------------------------------------------------------------------
+    report = sections[6] = section_header("6. LIKELY RENUMBERED / RENAMED COURSES")
+
+    matches = find_renumber_candidates(
+        lookups["catalog"], registry_lookup, new_req_ids | orphaned
+    )
+    if matches:
+        report.append(f"\n  {len(matches)} candidate pair(s), ranked by confidence:")
+        report.append("  Review manually; confirmed pairs should be updated in requirements/registry.")
+        report.append("")
+        for cid, other, confidence, signals in matches:
+            origin = "orphaned" if cid in orphaned else "new"
+            parts = [f"{k}={v:.2f}" for k, v in signals.items() if v is not None]
+            report.append(f"    {confidence:.2f}  {cid} [{origin}] -> {other}  ({', '.join(parts)})")
+    else:
+        report.append("  No likely renumber/rename pairs found.")
+
+    result = {"new_req_ids": new_req_ids, "orphaned": orphaned, "matches": matches}
+    return result, sections
+
+
+def count_changes(changes):
+    return (
         len(changes["offered_updates"])
         + len(changes["credit_updates"])
         + len(changes["catalog_title_updates"])
     )
-    report.append(f"  Registry entries:      {len(registry)}")
-    report.append(f"  Catalog entries:       {len(catalog)}")
-    report.append(f"  Requirement course IDs: {len(req_ids)}")
-    report.append(f"  Offered flag updates:  {len(changes['offered_updates'])}")
-    report.append(f"  Credit unit updates:   {len(changes['credit_updates'])}")
-    report.append(f"  Title updates:         {len(changes['catalog_title_updates'])}")
-    report.append(f"  New IDs needing add:   {len(new_req_ids)}")
-    report.append(f"  Orphaned entries:      {len(orphaned)}")
-    report.append(f"  Total auto-fixable:    {total_changes}")
 
-    return changes, new_req_ids, report
+
+def join_sections(sections):
+    """Concatenate numbered report sections in order, separated by a blank line."""
+    report = []
+    for number in sorted(sections):
+        if report:
+            report.append("")
+        report.extend(sections[number])
+    return report
+
+
+def summary_lines(title, catalog, registry, req_ids, changes, result):
+    lines = [""] + section_header(title)
+    lines.append(f"  Registry entries:      {len(registry)}")
+    lines.append(f"  Catalog entries:       {len(catalog)}")
+    lines.append(f"  Requirement course IDs: {len(req_ids)}")
+    lines.append(f"  Offered flag updates:  {len(changes['offered_updates'])}")
+    lines.append(f"  Credit unit updates:   {len(changes['credit_updates'])}")
+    lines.append(f"  Title updates:         {len(changes['catalog_title_updates'])}")
+    lines.append(f"  New IDs needing add:   {len(result['new_req_ids'])}")
+    lines.append(f"  Orphaned entries:      {len(result['orphaned'])}")
+    lines.append(f"  Renumber candidates:   {len(result['matches'])}")
+    lines.append(f"  Total auto-fixable:    {count_changes(changes)}")
+    return lines
+
+
+def reconcile(catalog, registry, req_ids, course_to_majors, lookups=None):
+    """Run all reconciliation checks for one set of requirements. Returns changes dict and report lines."""
+    lookups = lookups or build_lookups(catalog, registry)
+
+    changes, sections = registry_checks(registry, lookups)
+    result, requirement_sections = requirement_checks(lookups, req_ids, course_to_majors)
+    sections.update(requirement_sections)
+
+    report = join_sections(sections)
+    report.extend(summary_lines("SUMMARY", catalog, registry, req_ids, changes, result))
+
+    return changes, result["new_req_ids"], report
+
+
+# ============================================================================
+# Multi-Cohort Reconciliation
+# ============================================================================
+
+def load_cohorts(path=COHORTS_PATH):
+    """Load cohort requirement bundles as a list of (cohort name, core, majors).
+
+    Bundles are listed in COHORTS_PATH (paths relative to that file). Without
+    it, the single default core + majors pair is used.
+    """
+    if not path.exists():
+        core = load_json(CORE_REQ_PATH)
+        return [(core.get("class", "Default cohort"), core, load_json(MAJOR_REQ_PATH))]
+
+    bundles = []
+    for bundle in load_json(path)["cohorts"]:
+        core = load_json(path.parent / bundle["core"])
+        majors = load_json(path.parent / bundle["majors"])
+        bundles.append((bundle.get("cohort") or core.get("class"), core, majors))
+    return bundles
+
+
+def implied_core_credits(core):
+    """Course ID -> CU implied by single-course core requirements (e.g. MGMT6100 -> 0.5)."""
+    return {
+        req["courses"][0]: float(req["credits_required"])
+        for req in core["core_requirements"]
+        if len(req["courses"]) == 1 and req.get("credits_required") is not None
+    }
+
+
+def merge_cohort_results(lookups, cohort_results):
+    """Combine per-cohort results into one registry update and detect conflicts.
+
+    cohort_results: list of (cohort name, req_ids, result, implied credits).
+    Conflicts are decisions that cannot be made for the registry as a whole:
+      - renumber: a cohort proposes replacing a registry entry another cohort still uses
+      - credit_units: cohorts' single-course cores imply different CU for the same course
+    """
+    registry_ids = lookups["registry_ids"]
+    referenced_by = {}
+    for name, req_ids, _, _ in cohort_results:
+        for cid in req_ids:
+            referenced_by.setdefault(cid, []).append(name)
+
+    additions = {}
+    for name, _, result, _ in cohort_results:
+        for cid in result["new_req_ids"]:
+            additions.setdefault(cid, []).append(name)
+
+    removable = registry_ids - set(referenced_by)
+    retained = {
+        cid: sorted(referenced_by[cid])
+        for name, _, result, _ in cohort_results
+        for cid in result["orphaned"]
+        if cid in referenced_by
+    }
+
+    conflicts = []
+    for name, _, result, _ in cohort_results:
+        for cid, other, confidence, _ in result["matches"]:
+            # The registry side of the pair is what a rename would replace
+            for replaced in (cid, other):
+                users = [c for c in referenced_by.get(replaced, []) if c != name]
+                if replaced in registry_ids and replaced in result["orphaned"] and users:
+                    conflicts.append({
+                        "type": "renumber",
+                        "course_id": replaced,
+                        "detail": f"{name} proposes {cid} -> {other} ({confidence:.2f}), "
+                                  f"but {replaced} is still used by {', '.join(users)}",
+                    })
+
+    implied = {}
+    for name, _, _, credits in cohort_results:
+        for cid, cu in credits.items():
+            implied.setdefault(cid, {})[name] = cu
+    for cid, by_cohort in sorted(implied.items()):
+        if len(set(by_cohort.values())) > 1:
+            detail = ", ".join(f"{name}={cu}" for name, cu in sorted(by_cohort.items()))
+            conflicts.append({"type": "credit_units", "course_id": cid, "detail": f"core CU differs: {detail}"})
+
+    return {
+        "additions": {cid: sorted(names) for cid, names in sorted(additions.items())},
+        "removable": sorted(removable),
+        "retained": dict(sorted(retained.items())),
+        "conflicts": conflicts,
+    }
+
+
+def reconcile_cohorts(catalog, registry, cohorts, lookups=None):
+    """Reconcile every cohort against one shared catalog/registry index.
+
+    Returns (changes, merged, report): the auto-fixable registry changes (the
+    same for every cohort), the merged registry update (see
+    merge_cohort_results) and the report lines.
+    """
+    lookups = lookups or build_lookups(catalog, registry)
+    changes, sections = registry_checks(registry, lookups)
+
+    report = section_header(f"SHARED: CATALOG vs REGISTRY ({len(cohorts)} cohort(s))")
+    report.append("")
+    report.extend(join_sections(sections))
+
+    cohort_results = []
+    for name, core, majors in cohorts:
+        req_ids = extract_requirement_ids(core, majors)
+        result, cohort_sections = requirement_checks(lookups, req_ids, build_course_to_majors(majors))
+        cohort_results.append((name, req_ids, result, implied_core_credits(core)))
+
+        report.extend(["", ""] + section_header(f"COHORT: {name}") + [""])
+        report.extend(join_sections(cohort_sections))
+        report.extend(summary_lines(f"SUMMARY — {name}", catalog, registry, req_ids, changes, result))
+
+    merged = merge_cohort_results(lookups, cohort_results)
+
+    report.extend(["", ""] + section_header("MERGED REGISTRY UPDATE (all cohorts)"))
+    report.append(f"  Auto-fixable changes:  {count_changes(changes)}")
+    report.append(f"  IDs needing add:       {len(merged['additions'])}")
+    for cid, names in merged["additions"].items():
+        report.append(f"    + {cid} — needed by: {', '.join(names)}")
+    report.append(f"  Orphaned in all cohorts (removable): {len(merged['removable'])}")
+    report.append(f"  Orphaned in some cohorts (retained): {len(merged['retained'])}")
+    for cid, names in merged["retained"].items():
+        report.append(f"    = {cid} — still used by: {', '.join(names)}")
+    report.append(f"  Conflicts:             {len(merged['conflicts'])}")
+    for conflict in merged["conflicts"]:
+        report.append(f"    ! [{conflict['type']}] {conflict['course_id']}: {conflict['detail']}")
+
+    return changes, merged, report
+
+
+# ============================================================================
+# Substitution Index
+# ============================================================================
+
+class PrefixTrie:
+    """Character trie over course IDs; all IDs under a prefix in O(len(prefix) + matches)."""
+
+    def __init__(self, words=()):
+        self.root = {}
+        for word in words:
+            self.insert(word)
+
+    def insert(self, word):
+        node = self.root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[None] = word  # terminal marker
+
+    def with_prefix(self, prefix):
+        node = self.root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return []
+        found = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for ch, child in node.items():
+                if ch is None:
+                    found.append(child)
+                else:
+                    stack.append(child)
+        return sorted(found)
+
+
+def build_substitution_index(core, trie):
+    """Core code -> eligible substitution courses, and course ID -> cores it can substitute.
+
+    Eligibility matches core-rules.ts: any catalog/registry course starting with
+    one of `eligible_course_prefixes`, plus any course in `eligible_courses`.
+    """
+    core_to_courses = {}
+    course_to_cores = {}
+    for req in core["core_requirements"]:
+        sub = (req.get("waiver_details") or {}).get("substitution")
+        if not sub:
+            continue
+        prefixes = sub.get("eligible_course_prefixes", [])
+        explicit = sub.get("eligible_courses", [])
+        courses = set(explicit)
+        for prefix in prefixes:
+            courses.update(trie.with_prefix(prefix))
+
+        core_to_courses[req["core_code"]] = {
+            "prefixes": prefixes,
+            "eligible_courses": explicit,
+            "credits_required": sub.get("credits_required"),
+            "courses": sorted(courses),
+        }
+        for cid in courses:
+            course_to_cores.setdefault(cid, []).append(req["core_code"])
+
+    return {
+        "core_to_courses": core_to_courses,
+        "course_to_cores": {cid: sorted(codes) for cid, codes in sorted(course_to_cores.items())},
+    }
+
+
+def export_substitution_index(lookups, cohorts, path=SUBSTITUTION_INDEX_PATH, write=True):
+    """Regenerate the per-cohort substitution index over catalog + registry course IDs.
+
+    With write=False the index is only built (report mode leaves the tracked
+    file, and its generated timestamp, untouched).
+    """
+    course_ids = lookups["catalog_ids"] | lookups["registry_ids"]
+    trie = PrefixTrie(course_ids)
+    index = {
+        "generated": datetime.now().isoformat(),
+        "courses_indexed": len(course_ids),
+        "cohorts": {name: build_substitution_index(core, trie) for name, core, _ in cohorts},
+    }
+    if write:
+        save_json(path, index)
+    return index
 
 
 # ============================================================================
@@ -310,7 +763,12 @@ def apply_changes(registry, changes):
 # ============================================================================
 
 def main():
-    apply_mode = "--apply" in sys.argv
+    parser = argparse.ArgumentParser(description="Reconcile catalog, registry and requirements.")
+    parser.add_argument("--apply", action="store_true", help="Apply changes to the registry")
+    parser.add_argument("--cohorts", type=Path, default=COHORTS_PATH,
+                        help="Cohort list to reconcile (default: Student Requirements/cohorts.json)")
+    args = parser.parse_args()
+    apply_mode = args.apply
 
     print(f"CourseHub Reconciliation — {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"Mode: {'APPLY' if apply_mode else 'REPORT ONLY (use --apply to write changes)'}")
@@ -319,49 +777,50 @@ def main():
     # Load data
     catalog = load_json(CATALOG_PATH)
     registry = load_json(REGISTRY_PATH)
-    core = load_json(CORE_REQ_PATH)
-    majors = load_json(MAJOR_REQ_PATH)
-
-    # Extract requirement IDs
-    req_ids = extract_requirement_ids(core, majors)
-    course_to_majors = build_course_to_majors(majors)
+    cohorts = load_cohorts(args.cohorts)
 
-    # Run reconciliation
-    changes, new_req_ids, report = reconcile(catalog, registry, req_ids, course_to_majors)
+    # Run reconciliation (catalog/registry indexed once for all cohorts)
+    lookups = build_lookups(catalog, registry)
+    changes, merged, report = reconcile_cohorts(catalog, registry, cohorts, lookups)
+    index = export_substitution_index(lookups, cohorts, write=apply_mode)
+    new_req_ids = merged["additions"]
 
     # Print report
     for line in report:
         print(line)
+    for name, cohort_index in index["cohorts"].items():
+        print(f"\n  Substitution index ({name}): {len(cohort_index['core_to_courses'])} core(s), "
+              f"{len(cohort_index['course_to_cores'])} eligible course(s)")
+    if apply_mode:
+        print(f"  Wrote {SUBSTITUTION_INDEX_PATH.relative_to(BASE_DIR)}")
 
     # Apply if requested
     if apply_mode:
-        total_changes = (
-            len(changes["offered_updates"])
-            + len(changes["credit_updates"])
-            + len(changes["catalog_title_updates"])
-        )
+        total_changes = count_changes(changes)
         if total_changes > 0:
             applied = apply_changes(registry, changes)
             registry.sort(key=lambda x: x["course_id"])
             save_json(REGISTRY_PATH, registry)
             print(f"\n  Applied {applied} changes to {REGISTRY_PATH}")
+
+            # Imported here: catalog_binary itself imports this module
+            from catalog_binary import write_catalog_binary
+            write_catalog_binary(catalog, registry, log=lambda line: print(f"  {line}"))
         else:
             print("\n  No auto-fixable changes to apply.")
 
         if new_req_ids:
             print(f"\n  WARNING: {len(new_req_ids)} new course ID(s) need manual addition to the registry.")
             print("  See section 2 above for details.")
+        if merged["conflicts"]:
+            print(f"\n  WARNING: {len(merged['conflicts'])} cross-cohort conflict(s) need review.")
     else:
-        total_changes = (
-            len(changes["offered_updates"])
-            + len(changes["credit_updates"])
-            + len(changes["catalog_title_updates"])
-        )
+        total_changes = count_changes(changes)
         if total_changes > 0:
             print(f"\n  Run with --apply to write {total_changes} changes to the registry.")
 
     print()
-    return 0 if not new_req_ids else 1
+    return 0 if not new_req_ids and not merged["conflicts"] else 1
 
 
 if __name__ == "__main__":
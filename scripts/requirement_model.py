@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Shared Requirement Model
+
+Compiles the requirements JSON files into a flat, solver-friendly form used by
+the offline planning tools (generate_initial_plans.py and friends):
+
+  - Credit units are counted in integer HALF-CU units (0.5 CU -> 1, 1.0 CU -> 2)
+    so state vectors can be hashed and memoized exactly.
+  - Each major becomes a list of "buckets" (a course set that must reach a
+    minimum number of units) and "caps" (a course set that may not exceed a
+    maximum), mirroring the checks in src/lib/validation/major-rules.ts.
+  - Catalog prerequisite strings ("FNCE 6110 AND (ACCT 6110 OR ACCT 6130)")
+    are parsed into CNF: a list of clauses, each a set of alternative IDs.
+
+The quarter grid and default core placements mirror src/types/plan.ts and
+src/lib/scheduling/initial-plan.ts; keep them in sync when either changes.
+"""
+
+import re
+
+from crosslist_clusters import load_crosslist_clusters
+from reconcile import parse_credit_units, PrefixTrie, build_substitution_index
+from quarter_availability import QUARTER_ID_BITS, catalog_quarter_masks
+
+# ============================================================================
+# Plan Grid (mirrors src/types/plan.ts)
+# ============================================================================
+
+QUARTER_IDS = [
+    "Y1F_Q1", "Y1F_Q2", "Y1S_Q3", "Y1S_Q4",
+    "Y2F_Q5", "Y2F_Q6", "Y2S_Q7", "Y2S_Q8",
+]
+QUARTER_TERM = {q: ("Fall" if "F_" in q else "Spring") for q in QUARTER_IDS}
+QUARTER_SEMESTER = {q: q.split("_")[0] for q in QUARTER_IDS}
+SEMESTER_QUARTERS = {
+    sem: [q for q in QUARTER_IDS if QUARTER_SEMESTER[q] == sem]
+    for sem in ("Y1F", "Y1S", "Y2F", "Y2S")
+}
+
+# Per-quarter CU load (mirrors CU_LOAD_DEFAULTS in src/lib/data/constants.ts)
+CU_LOAD_DEFAULTS = {"light": 2.0, "normal": 2.5, "heavy": 3.0}
+
+# Graduation range and overload thresholds (mirrors CU_LIMITS in src/lib/data/constants.ts)
+CU_LIMITS = {
+    "GRADUATION_MIN": 19,
+    "GRADUATION_MAX": 21,
+    "QUARTER_OVERLOAD_THRESHOLD": 2.75,
+    "SEMESTER_OVERLOAD_THRESHOLD": 5.5,
+}
+
+# Mutually exclusive majors (mirrors MAJOR_EXCLUSIONS / MKOP_EXCLUSIONS in src/types/user.ts)
+MAJOR_EXCLUSIONS = [
+    ("FNCE", "QFNC"),
+    ("ESGB", "BEES"),
+    ("ESGB", "SOGO"),
+    ("MKOP", "MKTG"),
+    ("MKOP", "OIDD"),
+]
+
+# Core courses that may not double-count toward a major (data-architecture.md §6.3)
+DOUBLE_COUNT_EXCLUSIONS = {
+    "AIFB": {"OIDD6130", "OIDD6620"},
+    "ENTR": {"OIDD6140", "OIDD6620"},
+    "LEAD": {"OIDD6900"},
+    "MGMT": {"OIDD6900"},
+}
+
+
+def to_units(cu):
+    """Convert a CU value to integer half-CU units."""
+    return int(round(float(cu) * 2))
+
+
+def majors_compatible(a, b):
+    return (a, b) not in MAJOR_EXCLUSIONS and (b, a) not in MAJOR_EXCLUSIONS
+
+
+# ============================================================================
+# Course Data
+# ============================================================================
+
+def build_credit_lookup(catalog, registry):
+    """Course ID -> half-CU units. Catalog wins over registry, like course-resolver.ts."""
+    units = {}
+    for r in registry:
+        if r.get("credit_units") is not None:
+            units[r["course_id"]] = to_units(r["credit_units"])
+    for c in catalog:
+        cu = parse_credit_units(c.get("Credit_Units"))
+        if cu is not None:
+            units[c["Course_ID"]] = to_units(cu)
+    return units
+
+
+def build_crosslist_lookup():
+    """Course/section ID -> crosslist cluster ID (see crosslist_clusters.py)."""
+    return load_crosslist_clusters()["id_to_cluster"]
+
+
+def course_key(course_id, crosslists):
+    """Comparison key: crosslisted equivalents share one cluster ID, others compare by ID."""
+    return crosslists.get(course_id, course_id)
+
+
+def build_term_lookup(catalog):
+    """Course ID -> set of terms ("Fall"/"Spring") the course is offered in."""
+    terms = {}
+    for c in catalog:
+        availability = c.get("Term_Availability")
+        if availability == "Both":
+            terms[c["Course_ID"]] = {"Fall", "Spring"}
+        elif availability in ("Fall", "Spring"):
+            terms[c["Course_ID"]] = {availability}
+    return terms
+
+
+def build_quarter_lookup(catalog):
+    """Course ID -> quarter availability bitmask (see quarter_availability.py).
+
+    Uses the exported Quarter_Mask field when the catalog has one, otherwise
+    derives masks from the Meeting_Times_* date ranges. Courses without any
+    meeting data are left out (only their term availability is known).
+    """
+    if any(c.get("Quarter_Mask") not in (None, "") for c in catalog):
+        masks = {c["Course_ID"]: int(float(c["Quarter_Mask"])) for c in catalog
+                 if c.get("Quarter_Mask") not in (None, "")}
+    else:
+        masks = catalog_quarter_masks(catalog)
+    return {cid: mask for cid, mask in masks.items() if mask}
+
+
+def quarter_available(mask, quarter, units):
+    """Whether a course with this quarter mask can be placed in a plan quarter.
+
+    Half-semester courses need a section in that exact quarter; semester-long
+    courses (tracked in the semester's first quarter) need any section that term.
+    """
+    if units >= 2:
+        return any(mask & QUARTER_ID_BITS[q] for q in SEMESTER_QUARTERS[QUARTER_SEMESTER[quarter]])
+    return bool(mask & QUARTER_ID_BITS[quarter])
+
+
+def parse_prerequisites(text):
+    """Parse a catalog prerequisite string into CNF clauses of course IDs.
+
+    "FNCE 6110 AND (ACCT 6110 OR ACCT 6130)" -> [{"FNCE6110"}, {"ACCT6110", "ACCT6130"}]
+    Clauses without a recognisable course ID are dropped.
+    """
+    clauses = []
+    for part in re.split(r"\s+AND\s+", text or "", flags=re.IGNORECASE):
+        ids = {dept + num for dept, num in re.findall(r"\b([A-Z]{3,4})\s?(\d{4})\b", part)}
+        if ids:
+            clauses.append(ids)
+    return clauses
+
+
+def build_prerequisite_lookup(catalog):
+    """Course ID -> CNF prerequisite clauses (only courses that have any)."""
+    prereqs = {}
+    for c in catalog:
+        clauses = parse_prerequisites(c.get("Prerequisites"))
+        if clauses:
+            prereqs[c["Course_ID"]] = clauses
+    return prereqs
+
+
+# ============================================================================
+# Major Compilation (mirrors src/lib/validation/major-rules.ts)
+# ============================================================================
+
+def _elective_pool(elective):
+    """Courses counted by an elective block and the caps that apply to sub-pools."""
+    pool = set(elective.get("courses", []))
+    caps = []
+    non_wharton = set(elective.get("non_wharton_courses", []))
+    if non_wharton:
+        pool |= non_wharton
+        caps.append(("non_wharton", frozenset(non_wharton),
+                     to_units(elective.get("non_wharton_max_credits", 0))))
+    additional = elective.get("additional_courses")
+    if additional:
+        pool |= set(additional["courses"])
+        if additional.get("max_credits") is not None:
+            caps.append(("additional", frozenset(additional["courses"]),
+                         to_units(additional["max_credits"])))
+    return pool, caps
+
+
+def compile_major(major):
+    """Compile a major into (buckets, caps).
+
+    buckets: list of (label, frozenset(course_ids), min_units)
+    caps:    list of (label, frozenset(course_ids), max_units)
+    A course counts toward every bucket that lists it, as in the app validator,
+    and every major also gets a total-credits bucket over all of its courses.
+    """
+    code = major["major_code"]
+    reqs = major["requirements"]
+    buckets = []
+    caps = []
+
+    required = reqs.get("required_courses")
+    if required:
+        if required.get("selection_type", "all") == "all":
+            # Every listed course must be present
+            for cid in required["courses"]:
+                buckets.append((f"{code}:required:{cid}", frozenset([cid]), 1))
+        elif to_units(required.get("credits_required", 0)) > 0:
+            buckets.append((f"{code}:required", frozenset(required["courses"]),
+                            to_units(required["credits_required"])))
+
+    elective = reqs.get("elective_courses")
+    if elective:
+        pool, elective_caps = _elective_pool(elective)
+        buckets.append((f"{code}:electives", frozenset(pool), to_units(elective["credits_required"])))
+        caps.extend((f"{code}:{label}", courses, units) for label, courses, units in elective_caps)
+
+    pillars = reqs.get("pillars", [])
+    for pillar in pillars:
+        label = f"{code}:pillar:{pillar['pillar_code']}"
+        courses = frozenset(pillar["courses"])
+        credits_type = pillar.get("credits_type")
+        if credits_type == "maximum":
+            caps.append((label, courses, to_units(pillar["credits_required"])))
+        elif credits_type != "combined_with_other_pillars":
+            buckets.append((label, courses, to_units(pillar["credits_required"])))
+
+    # Total major credits across every list. The app validator doesn't check this
+    # for COMBINED majors, but without it a course listed as both required and
+    # elective would count twice toward the total.
+    total = major_course_ids(buckets, caps).union(
+        required["courses"] if required else (), *(p["courses"] for p in pillars)
+    )
+    total_bucket = (f"{code}:total", total, to_units(major["total_credits_required"]))
+    if not any(b[1:] == total_bucket[1:] for b in buckets):
+        buckets.append(total_bucket)
+
+    return buckets, caps
+
+
+def major_course_ids(buckets, caps=()):
+    """Every course ID referenced by a compiled major."""
+    ids = set()
+    for _, courses, _ in list(buckets) + list(caps):
+        ids |= courses
+    return ids
+
+
+# ============================================================================
+# Core Compilation (mirrors src/lib/validation/core-rules.ts)
+# ============================================================================
+
+def compile_core(core, waivers, course_ids=()):
+    """Compile core requirements for a waiver set into (core_code, courses, need, mode).
+
+    waivers:    {core_code: "waiver" | "substitution" | "placement"}
+    course_ids: every known course ID, for substitution prefix matching
+    mode "any"   — satisfied once any listed course is in the plan (need = 1 course)
+    mode "units" — needs `need` half-CU units from the listed courses (OIDD_FLEX,
+                   and substituted cores counting their eligible courses)
+    Fully waived cores are left out; they are always satisfied.
+    """
+    substitutions = None
+    compiled = []
+    for req in core["core_requirements"]:
+        code = req["core_code"]
+        waiver = waivers.get(code)
+        if waiver == "waiver":
+            continue
+        if waiver == "substitution" and (req.get("waiver_details") or {}).get("substitution"):
+            if substitutions is None:
+                substitutions = build_substitution_index(core, PrefixTrie(course_ids))["core_to_courses"]
+            sub = substitutions[code]
+            compiled.append((code, frozenset(sub["courses"]), to_units(sub["credits_required"]), "units"))
+        elif code == "OIDD_FLEX":
+            compiled.append((code, frozenset(req["courses"]), to_units(req["credits_required"]), "units"))
+        else:
+            compiled.append((code, frozenset(req["courses"]), 1, "any"))
+    return compiled
+
+
+# ============================================================================
+# Core Placements (mirrors src/lib/scheduling/initial-plan.ts)
+# ============================================================================
+
+FIXED_CORE_PLACEMENTS = [
+    ("MGMT6100", "Y1F_Q1", "MGMT_FOUNDATION"),
+    ("BEPP6110", "Y1F_Q1", "BEPP_MICRO_FOUNDATIONS"),
+    ("MKTG6110", "Y1F_Q1", "MKTG_FIXED"),
+    ("BEPP6120", "Y1F_Q2", "BEPP_MICRO_ADVANCED"),
+]
+
+FLEX_CORE_DEFAULTS = [
+    ("STAT6130", "Y1F_Q1", "STAT_CORE"),
+    ("WHCP6160", "Y1F_Q2", "WHCP"),
+    ("ACCT6130", "Y1S_Q3", "ACCT_FLEX"),
+    ("FNCE6110", "Y1S_Q3", "FNCE_CORP_FLEX"),
+    ("FNCE6130", "Y1S_Q4", "FNCE_MACRO_FLEX"),
+    ("LGST6110", "Y1S_Q3", "LGST_FLEX"),
+    ("MGMT6110", "Y1S_Q4", "MGMT_FLEX"),
+    ("MKTG6120", "Y1S_Q4", "MKTG_FLEX"),
+    ("OIDD6110", "Y2F_Q5", "OIDD_FLEX"),
+    ("OIDD6120", "Y2F_Q5", "OIDD_FLEX"),
+]
+
+
+def normalize_quarter(quarter, units):
+    """Semester-long courses (>= 1.0 CU) are tracked in the first quarter of their semester."""
+    if units >= 2:
+        return SEMESTER_QUARTERS[QUARTER_SEMESTER[quarter]][0]
+    return quarter
+
+
+def core_placements(waivers, credit_units):
+    """Default core placements for a waiver set, as generateInitialPlan builds them.
+
+    waivers: {core_code: "waiver" | "substitution" | "placement"}
+    Returns a list of (course_id, quarter).
+    """
+    placements = []
+    seen = set()
+    for course_id, quarter, core_code in FIXED_CORE_PLACEMENTS + FLEX_CORE_DEFAULTS:
+        waiver = waivers.get(core_code)
+        if waiver in ("waiver", "substitution"):
+            continue
+        if waiver == "placement" and core_code == "STAT_CORE":
+            course_id = "STAT6210"
+        if course_id in seen:
+            continue
+        seen.add(course_id)
+        units = credit_units.get(course_id, 1)
+        placements.append((course_id, normalize_quarter(quarter, units)))
+    return placements
+
+
+def waived_core_courses(core, waivers):
+    """Course IDs whose core requirement is waived/substituted (count as prerequisites met)."""
+    ids = set()
+    for req in core["core_requirements"]:
+        if waivers.get(req["core_code"]) in ("waiver", "substitution"):
+            ids |= set(req["courses"])
+    return ids
@@ -0,0 +1,178 @@
+"""Row-hash diff and generated SQL of sync_to_postgres, against a fake cursor."""
+
+import pytest
+
+pytest.importorskip("psycopg")
+
+from sync_to_postgres import (
+    TABLES, build_rows, compute_diff, create_schema, fetch_current_hashes, missing_columns, sync_table,
+)
+
+REGISTRY = TABLES["registry"]
+
+
+def registry_record(course_id, title="Title", credit_units=1.0, offered=True):
+    return {
+        "course_id": course_id,
+        "course_title": title,
+        "department": course_id[:4],
+        "credit_units": credit_units,
+        "is_wharton": True,
+        "currently_offered": offered,
+        "catalog_source": "catalog",
+    }
+
+
+class FakeCopy:
+    def __init__(self, cursor, statement):
+        self.cursor = cursor
+        self.statement = statement
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write_row(self, row):
+        self.cursor.copied.setdefault(self.statement, []).append(tuple(row))
+
+
+class FakeCursor:
+    def __init__(self, rows=()):
+        self.statements = []
+        self.copied = {}
+        self.rows = list(rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query):
+        self.statements.append(query.as_string(None))
+
+    def copy(self, query):
+        statement = query.as_string(None)
+        self.statements.append(statement)
+        return FakeCopy(self, statement)
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, rows=()):
+        self.cur = FakeCursor(rows)
+
+    def cursor(self):
+        return self.cur
+
+
+# ============================================================================
+# Row hash + diff
+# ============================================================================
+
+def test_build_rows_renders_copy_text_and_appends_hash():
+    rows = build_rows(REGISTRY, [registry_record("FNCE6110", credit_units=0.5, offered=False)])
+    values = rows["FNCE6110"]
+    assert values[:-1] == ("FNCE6110", "Title", "FNCE", "0.5", "true", "false", "catalog")
+    assert len(values[-1]) == 32
+
+
+def test_row_hash_distinguishes_null_from_empty_string():
+    with_null = build_rows(REGISTRY, [{**registry_record("FNCE6110"), "course_title": None}])
+    with_empty = build_rows(REGISTRY, [{**registry_record("FNCE6110"), "course_title": ""}])
+    assert with_null["FNCE6110"][-1] != with_empty["FNCE6110"][-1]
+
+
+def test_compute_diff_uses_row_hash():
+    current = {
+        cid: values[-1]
+        for cid, values in build_rows(REGISTRY, [
+            registry_record("ACCT6110"), registry_record("FNCE6110"), registry_record("MGMT6100"),
+        ]).items()
+    }
+    desired = build_rows(REGISTRY, [
+        registry_record("ACCT6110"),                  # unchanged
+        registry_record("FNCE6110", title="New"),     # changed
+        registry_record("STAT6130"),                  # new
+    ])
+    assert compute_diff(desired, current) == {
+        "inserts": ["STAT6130"], "updates": ["FNCE6110"], "deletes": ["MGMT6100"],
+    }
+
+
+def test_fetch_current_hashes():
+    conn = FakeConnection(rows=[("FNCE6110", "abc")])
+    assert fetch_current_hashes(conn, REGISTRY) == {"FNCE6110": "abc"}
+    assert conn.cur.statements == ['SELECT "course_id", row_hash FROM "course_registry"']
+
+
+# ============================================================================
+# Generated SQL
+# ============================================================================
+
+def test_sync_table_stages_upserts_and_deletes():
+    desired = build_rows(REGISTRY, [registry_record("FNCE6110"), registry_record("STAT6130")])
+    diff = {"inserts": ["STAT6130"], "updates": ["FNCE6110"], "deletes": ["MGMT6100"]}
+    conn = FakeConnection()
+    sync_table(conn, REGISTRY, desired, diff)
+
+    cols = ('"course_id", "course_title", "department", "credit_units", '
+            '"is_wharton", "currently_offered", "catalog_source", "row_hash"')
+    create_stage, copy_stage, merge, create_deletes, copy_deletes, delete = conn.cur.statements
+    assert create_stage == (
+        f'CREATE TEMP TABLE "stage_course_registry" ON COMMIT DROP AS '
+        f'SELECT {cols} FROM "course_registry" WITH NO DATA'
+    )
+    assert copy_stage == f'COPY "stage_course_registry" ({cols}) FROM STDIN'
+    assert merge.startswith(
+        f'INSERT INTO "course_registry" ({cols}) SELECT {cols} FROM "stage_course_registry" '
+        f'ON CONFLICT ("course_id") DO UPDATE SET "course_title" = EXCLUDED."course_title", '
+    )
+    assert '"course_id" = EXCLUDED' not in merge
+    assert merge.endswith('"row_hash" = EXCLUDED."row_hash", synced_at = now()')
+    assert create_deletes == (
+        'CREATE TEMP TABLE "stage_course_registry_deletes" ("course_id" text PRIMARY KEY) ON COMMIT DROP'
+    )
+    assert copy_deletes == 'COPY "stage_course_registry_deletes" ("course_id") FROM STDIN'
+    assert delete == (
+        'DELETE FROM "course_registry" t USING "stage_course_registry_deletes" d '
+        'WHERE t."course_id" = d."course_id"'
+    )
+
+    # Inserts then updates go through COPY, each row with its hash
+    assert conn.cur.copied[copy_stage] == [desired["STAT6130"], desired["FNCE6110"]]
+    assert conn.cur.copied[copy_deletes] == [("MGMT6100",)]
+
+
+def test_sync_table_without_changes_issues_no_sql():
+    conn = FakeConnection()
+    sync_table(conn, REGISTRY, {}, {"inserts": [], "updates": [], "deletes": []})
+    assert conn.cur.statements == []
+
+
+# ============================================================================
+# Schema
+# ============================================================================
+
+def test_create_schema_adds_columns_to_existing_tables():
+    conn = FakeConnection()
+    create_schema(conn)
+    statements = conn.cur.statements
+    assert statements[0].startswith('CREATE TABLE IF NOT EXISTS "catalog_courses" (')
+    for col in ("section_offset", "section_length", "quarter_mask", "crosslist_cluster", "crosslist_canonical"):
+        assert f'ALTER TABLE "catalog_courses" ADD COLUMN IF NOT EXISTS "{col}" text' in statements
+    assert 'ALTER TABLE "course_registry" ADD COLUMN IF NOT EXISTS "credit_units" numeric' in statements
+    assert not any('ADD COLUMN IF NOT EXISTS "course_id"' in s for s in statements)
+
+
+def test_missing_columns_reports_fields_added_since_table_creation():
+    catalog = TABLES["catalog"]
+    old_columns = [col for col, _, _ in catalog["columns"]
+                   if col not in ("quarter_mask", "crosslist_cluster", "crosslist_canonical")]
+    conn = FakeConnection(rows=[(col,) for col in old_columns + ["row_hash", "synced_at"]])
+    assert missing_columns(conn, catalog) == ["quarter_mask", "crosslist_cluster", "crosslist_canonical"]
+    assert "'catalog_courses'" in conn.cur.statements[0]
@@ -0,0 +1,622 @@
+#!/usr/bin/env python3
+"""
+What-If Plan Validation Service
+
+Answers "what if I add / drop / move this course?" for a plan without
+re-running the whole validation. A session holds one plan and its validation
+state, and each operation updates only the requirement slots and quarters the
+course touches.
+
+Session state (CU in integer half-units, see requirement_model.py):
+  - units per requirement slot: major buckets and caps (compile_major) and
+    core requirements (compile_core), plus the set of slots currently failing
+  - units per quarter and per semester, and which of them are overloaded
+  - the placed total, and courses sitting in a quarter they aren't offered in
+
+Which slots a course feeds is precomputed once per (majors, waivers) in a
+RequirementIndex shared by every session with that combination, so an
+operation costs O(slots the course is listed in), independent of plan size.
+Slots are keyed by crosslist cluster (data/crosslist_clusters.json), so a
+crosslisted equivalent of a listed course counts toward the same slots.
+As in src/lib/validation, requirements count every course in the plan
+(staging included) while CU tracking only counts placed courses, each charged
+in full to its quarter. Cross-cutting rules (prohibited combinations, double-
+counting exclusions) are left to the app validator.
+
+Protocol: JSON over HTTP, on a local TCP port or a Unix socket.
+  POST   /sessions               {"majors": ["FNCE"], "waivers": {"STAT_CORE": "waiver"},
+                                  "placements": [["FNCE6110", "Y1S_Q3"], ...]}
+  GET    /sessions/<id>          full validation state
+  POST   /sessions/<id>/ops      {"ops": [{"op": "add", "course_id": "FNCE7500", "quarter": "Y2F_Q5"},
+                                          {"op": "move", "course_id": "FNCE6110", "quarter": "Y1S_Q4"},
+                                          {"op": "remove", "course_id": "MKTG6120"}],
+                                  "dry_run": false}
+  DELETE /sessions/<id>
+Quarters are plan QuarterIds (Y1F_Q1 ... Y2S_Q8) or "staging". With
+"dry_run": true the ops are evaluated and then rolled back.
+
+Usage:
+  python scripts/whatif_service.py                            # http://127.0.0.1:8765
+  python scripts/whatif_service.py --port 9000
+  python scripts/whatif_service.py --socket /tmp/coursehub-whatif.sock
+  python scripts/whatif_service.py --benchmark [--ops 20000]  # delta updates vs full re-validation
+"""
+
+import argparse
+import json
+import os
+import random
+import socketserver
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from reconcile import (
+    BASE_DIR, CATALOG_PATH, REGISTRY_PATH, CORE_REQ_PATH, MAJOR_REQ_PATH,
+    load_json,
+)
+from requirement_model import (
+    QUARTER_IDS, QUARTER_TERM, QUARTER_SEMESTER, SEMESTER_QUARTERS, CU_LIMITS,
+    build_credit_lookup, build_crosslist_lookup, course_key,
+    build_term_lookup, build_quarter_lookup, quarter_available,
+    compile_major, compile_core,
+)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+INITIAL_PLANS_PATH = BASE_DIR / "data" / "initial_plans.json"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+STAGING = "staging"
+
+# Thresholds in half-CU units (kept fractional: 2.75 CU = 5.5 units)
+GRADUATION_MIN = CU_LIMITS["GRADUATION_MIN"] * 2
+GRADUATION_MAX = CU_LIMITS["GRADUATION_MAX"] * 2
+QUARTER_OVERLOAD = CU_LIMITS["QUARTER_OVERLOAD_THRESHOLD"] * 2
+SEMESTER_OVERLOAD = CU_LIMITS["SEMESTER_OVERLOAD_THRESHOLD"] * 2
+
+# Slot kinds: "min" needs >= limit units, "max" allows <= limit units,
+# "any" needs at least one listed course
+SLOT_MIN, SLOT_MAX, SLOT_ANY = "min", "max", "any"
+
+
+def slot_failing(kind, units, count, limit):
+    if kind == SLOT_MIN:
+        return units < limit
+    if kind == SLOT_MAX:
+        return units > limit
+    return count == 0
+
+
+# ============================================================================
+# Static Model
+# ============================================================================
+
+class RequirementIndex:
+    """Requirement slots for one (majors, waivers) combination and course key -> slots.
+
+    Course keys are crosslist cluster IDs where the course has one (course_key).
+    """
+
+    def __init__(self, majors_data, core, majors, waivers, course_ids, crosslists):
+        self.labels, self.kinds, self.limits, self.keys = [], [], [], []
+        self.course_ids = set()
+        by_key = {}
+
+        def add_slot(label, kind, limit, courses):
+            keys = frozenset(course_key(cid, crosslists) for cid in courses)
+            for key in keys:
+                by_key.setdefault(key, []).append(len(self.labels))
+            self.labels.append(label)
+            self.kinds.append(kind)
+            self.limits.append(limit)
+            self.keys.append(keys)
+            self.course_ids |= courses
+
+        for code in majors:
+            buckets, caps = compile_major(majors_data["majors"][code])
+            for label, courses, need in buckets:
+                add_slot(label, SLOT_MIN, need, courses)
+            for label, courses, limit in caps:
+                add_slot(label, SLOT_MAX, limit, courses)
+        for code, courses, need, mode in compile_core(core, waivers, course_ids):
+            add_slot(f"core:{code}", SLOT_ANY if mode == "any" else SLOT_MIN, need, courses)
+
+        self.by_key = {key: tuple(slots) for key, slots in by_key.items()}
+
+
+class ValidationModel:
+    """Catalog-derived lookups plus a cache of RequirementIndex per (majors, waivers)."""
+
+    def __init__(self):
+        catalog = load_json(CATALOG_PATH)
+        registry = load_json(REGISTRY_PATH)
+        self.core = load_json(CORE_REQ_PATH)
+        self.majors_data = load_json(MAJOR_REQ_PATH)
+
+        self.credit_units = build_credit_lookup(catalog, registry)
+        self.terms = build_term_lookup(catalog)
+        self.quarters = build_quarter_lookup(catalog)
+        self.crosslists = build_crosslist_lookup()
+        self.course_ids = sorted({c["Course_ID"] for c in catalog} | {r["course_id"] for r in registry})
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def index(self, majors, waivers):
+        key = (tuple(sorted(majors)), tuple(sorted(waivers.items())))
+        with self._lock:
+            if key not in self._indexes:
+                unknown = [m for m in key[0] if m not in self.majors_data["majors"]]
+                if unknown:
+                    raise ValueError(f"Unknown major(s): {', '.join(unknown)}")
+                self._indexes[key] = RequirementIndex(
+                    self.majors_data, self.core, key[0], dict(key[1]), self.course_ids, self.crosslists
+                )
+            return self._indexes[key]
+
+    def key(self, course_id):
+        return course_key(course_id, self.crosslists)
+
+    def units(self, course_id):
+        # Unknown courses count 0 CU, like getCreditUnits() ?? 0 in the app
+        return self.credit_units.get(course_id, 0)
+
+    def offered_in(self, course_id, quarter):
+        """False when the catalog says the course doesn't run in that quarter."""
+        terms = self.terms.get(course_id)
+        if terms is not None and QUARTER_TERM[quarter] not in terms:
+            return False
+        mask = self.quarters.get(course_id)
+        return mask is None or quarter_available(mask, quarter, self.units(course_id))
+
+
+# ============================================================================
+# Incremental Session
+# ============================================================================
+
+class PlanSession:
+    """One plan's validation state, updated per operation."""
+
+    def __init__(self, model, majors, waivers, placements=()):
+        self.model = model
+        self.majors = sorted(majors)
+        self.waivers = dict(waivers)
+        self.index = model.index(self.majors, self.waivers)
+
+        n = len(self.index.labels)
+        self.slot_units = [0] * n
+        self.slot_count = [0] * n
+        self.failing = {i for i in range(n) if self._slot_failing(i)}
+
+        self.placements = {}
+        self.period_units = dict.fromkeys(list(QUARTER_IDS) + list(SEMESTER_QUARTERS), 0)
+        self.overloaded = set()
+        self.misplaced = set()
+        self.placed_units = 0
+
+        for course_id, quarter in placements:
+            self.add(course_id, quarter)
+
+    def _slot_failing(self, i):
+        index = self.index
+        return slot_failing(index.kinds[i], self.slot_units[i], self.slot_count[i], index.limits[i])
+
+    def _count(self, course_id, sign):
+        """Add (+1) or remove (-1) a course's contribution to its requirement slots."""
+        units = self.model.units(course_id)
+        slots = self.index.by_key.get(self.model.key(course_id), ())
+        for i in slots:
+            self.slot_units[i] += sign * units
+            self.slot_count[i] += sign
+            if self._slot_failing(i):
+                self.failing.add(i)
+            else:
+                self.failing.discard(i)
+        return slots
+
+    def _place(self, course_id, quarter, sign):
+        """Add or remove a course's CU in its quarter and semester."""
+        if quarter == STAGING:
+            self.misplaced.discard(course_id)
+            return ()
+        units = self.model.units(course_id)
+        semester = QUARTER_SEMESTER[quarter]
+        self.placed_units += sign * units
+        for period, threshold in ((quarter, QUARTER_OVERLOAD), (semester, SEMESTER_OVERLOAD)):
+            self.period_units[period] += sign * units
+            if self.period_units[period] > threshold:
+                self.overloaded.add(period)
+            else:
+                self.overloaded.discard(period)
+        if sign > 0 and not self.model.offered_in(course_id, quarter):
+            self.misplaced.add(course_id)
+        else:
+            self.misplaced.discard(course_id)
+        return (quarter, semester)
+
+    def add(self, course_id, quarter):
+        if course_id in self.placements:
+            raise ValueError(f"{course_id} is already in the plan")
+        _check_quarter(quarter)
+        self.placements[course_id] = quarter
+        return self._delta("add", course_id, self._count(course_id, 1), self._place(course_id, quarter, 1))
+
+    def remove(self, course_id):
+        if course_id not in self.placements:
+            raise ValueError(f"{course_id} is not in the plan")
+        quarter = self.placements.pop(course_id)
+        return self._delta("remove", course_id, self._count(course_id, -1), self._place(course_id, quarter, -1))
+
+    def move(self, course_id, quarter):
+        """Move a course between quarters/staging; requirement slots are unaffected."""
+        if course_id not in self.placements:
+            raise ValueError(f"{course_id} is not in the plan")
+        _check_quarter(quarter)
+        periods = self._place(course_id, self.placements[course_id], -1)
+        periods += self._place(course_id, quarter, 1)
+        self.placements[course_id] = quarter
+        return self._delta("move", course_id, (), periods)
+
+    def apply(self, op):
+        """Apply one {"op", "course_id", "quarter"} operation. Returns (delta, inverse op)."""
+        if not isinstance(op, dict):
+            raise ValueError(f"Each op must be an object with op and course_id, got {op!r}")
+        kind, course_id = op.get("op"), op.get("course_id")
+        if not isinstance(course_id, str):
+            raise ValueError(f"Op {kind!r} needs a string course_id, got {course_id!r}")
+        if kind == "add":
+            return self.add(course_id, op.get("quarter", STAGING)), {"op": "remove", "course_id": course_id}
+        if kind == "remove":
+            quarter = self.placements.get(course_id)
+            return self.remove(course_id), {"op": "add", "course_id": course_id, "quarter": quarter}
+        if kind == "move":
+            previous = self.placements.get(course_id)
+            return self.move(course_id, op.get("quarter", STAGING)), {"op": "move", "course_id": course_id, "quarter": previous}
+        raise ValueError(f"Unknown op: {kind}")
+
+    def _delta(self, op, course_id, slots, periods):
+        index = self.index
+        return {
+            "op": op,
+            "course_id": course_id,
+            "slots": {
+                index.labels[i]: slot_state(index.kinds[i], self.slot_units[i], self.slot_count[i], index.limits[i])
+                for i in slots
+            },
+            "periods": {p: self.period_units[p] / 2 for p in dict.fromkeys(periods)},
+            **self.status(),
+        }
+
+    def status(self):
+        return plan_status(len(self.failing), self.placed_units, len(self.placements),
+                           len(self.overloaded), len(self.misplaced))
+
+    def summary(self):
+        index = self.index
+        return validation_summary(
+            index, self.slot_units, self.slot_count, self.period_units,
+            sorted(index.labels[i] for i in self.failing), sorted(self.overloaded), sorted(self.misplaced),
+            self.status(),
+        )
+
+
+def _check_quarter(quarter):
+    if not isinstance(quarter, str) or (quarter != STAGING and quarter not in QUARTER_SEMESTER):
+        raise ValueError(f"Unknown quarter: {quarter}")
+
+
+def slot_state(kind, units, count, limit):
+    return {
+        "kind": kind,
+        "cu": units / 2,
+        "courses": count,
+        "limit": limit if kind == SLOT_ANY else limit / 2,
+        "ok": not slot_failing(kind, units, count, limit),
+    }
+
+
+def plan_status(failing, placed_units, plan_size, overloaded, misplaced):
+    # Graduation range is only checked once the plan has courses, as in engine.ts
+    below_min = plan_size > 0 and placed_units < GRADUATION_MIN
+    above_max = placed_units > GRADUATION_MAX
+    return {
+        "valid": failing == 0 and not below_min,
+        "errors": failing + below_min,
+        "warnings": overloaded + misplaced + above_max,
+        "total_cu": placed_units / 2,
+    }
+
+
+def validation_summary(index, slot_units, slot_count, period_units, failing, overloaded, misplaced, status):
+    return {
+        "slots": {
+            label: slot_state(index.kinds[i], slot_units[i], slot_count[i], index.limits[i])
+            for i, label in enumerate(index.labels)
+        },
+        "periods": {p: units / 2 for p, units in period_units.items()},
+        "failing": failing,
+        "overloaded": overloaded,
+        "misplaced": misplaced,
+        **status,
+    }
+
+
+def full_validate(model, index, placements):
+    """Validate a plan from scratch (every slot against the whole plan). Same output as summary()."""
+    plan_keys = [(cid, model.key(cid)) for cid in placements]
+    slot_units, slot_count, failing = [], [], []
+    for i, keys in enumerate(index.keys):
+        present = [cid for cid, key in plan_keys if key in keys]
+        slot_units.append(sum(model.units(cid) for cid in present))
+        slot_count.append(len(present))
+        if slot_failing(index.kinds[i], slot_units[i], slot_count[i], index.limits[i]):
+            failing.append(index.labels[i])
+
+    period_units = dict.fromkeys(list(QUARTER_IDS) + list(SEMESTER_QUARTERS), 0)
+    misplaced = []
+    for cid, quarter in placements.items():
+        if quarter == STAGING:
+            continue
+        period_units[quarter] += model.units(cid)
+        period_units[QUARTER_SEMESTER[quarter]] += model.units(cid)
+        if not model.offered_in(cid, quarter):
+            misplaced.append(cid)
+    overloaded = [p for p, units in period_units.items()
+                  if units > (QUARTER_OVERLOAD if p in QUARTER_SEMESTER else SEMESTER_OVERLOAD)]
+    placed_units = sum(units for p, units in period_units.items() if p in QUARTER_SEMESTER)
+
+    status = plan_status(len(failing), placed_units, len(placements), len(overloaded), len(misplaced))
+    return validation_summary(index, slot_units, slot_count, period_units,
+                              sorted(failing), sorted(overloaded), sorted(misplaced), status)
+
+
+# ============================================================================
+# Server
+# ============================================================================
+
+class WhatIfHandler(BaseHTTPRequestHandler):
+    server_version = "CourseHubWhatIf/1.0"
+
+    def address_string(self):
+        # Unix socket clients have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Request body is not valid JSON: {e}") from None
+
+    def _route(self):
+        parts = [p for p in self.path.split("?")[0].split("/") if p]
+        if not parts or parts[0] != "sessions":
+            return None, None
+        return (parts[1] if len(parts) > 1 else None), (parts[2] if len(parts) > 2 else None)
+
+    def _session(self, session_id):
+        session = self.server.sessions.get(session_id)
+        if session is None:
+            self._send(404, {"error": f"Unknown session: {session_id}"})
+        return session
+
+    def do_GET(self):
+        session_id, action = self._route()
+        if session_id is None or action is not None:
+            return self._send(404, {"error": "Not found"})
+        session = self._session(session_id)
+        if session:
+            with self.server.lock:
+                self._send(200, {"session_id": session_id, **session.summary()})
+
+    def do_DELETE(self):
+        session_id, action = self._route()
+        if session_id is None or action is not None:
+            return self._send(404, {"error": "Not found"})
+        with self.server.lock:
+            removed = self.server.sessions.pop(session_id, None)
+        if removed is None:
+            return self._send(404, {"error": f"Unknown session: {session_id}"})
+        self._send(200, {"session_id": session_id, "deleted": True})
+
+    def do_POST(self):
+        session_id, action = self._route()
+        try:
+            body = self._body()
+            if not isinstance(body, dict):
+                raise ValueError("Request body must be a JSON object")
+            if session_id is None:
+                session = PlanSession(self.server.model, *session_params(body))
+                session_id = uuid.uuid4().hex
+                with self.server.lock:
+                    self.server.sessions[session_id] = session
+                return self._send(201, {"session_id": session_id, **session.summary()})
+            if action != "ops":
+                return self._send(404, {"error": "Not found"})
+            session = self._session(session_id)
+            if session:
+                with self.server.lock:
+                    self._send(200, {"session_id": session_id, **apply_ops(session, body)})
+        except (ValueError, KeyError, TypeError) as e:
+            self._send(400, {"error": str(e)})
+
+
+def session_params(body):
+    """(majors, waivers, placements) from a create-session body; ValueError if malformed."""
+    majors, waivers, placements = body.get("majors", []), body.get("waivers", {}), body.get("placements", [])
+    if not isinstance(majors, list) or not all(isinstance(m, str) for m in majors):
+        raise ValueError("majors must be a list of major codes")
+    if not isinstance(waivers, dict):
+        raise ValueError("waivers must be an object of requirement -> waiver type")
+    if not isinstance(placements, list):
+        raise ValueError("placements must be a list of [course_id, quarter] pairs")
+    for placement in placements:
+        if not (isinstance(placement, list) and len(placement) == 2 and isinstance(placement[0], str)):
+            raise ValueError(f"Each placement must be a [course_id, quarter] pair, got {placement!r}")
+    return majors, waivers, placements
+
+
+def apply_ops(session, body):
+    """Apply a batch of ops atomically; roll back on error or when dry_run is set."""
+    ops = body.get("ops", [])
+    if not isinstance(ops, list):
+        raise ValueError("ops must be a list of operations")
+    deltas, undo = [], []
+    try:
+        for op in ops:
+            delta, inverse = session.apply(op)
+            deltas.append(delta)
+            undo.append(inverse)
+    except (ValueError, KeyError, TypeError):
+        rollback(session, undo)
+        raise
+    status = session.status()
+    if body.get("dry_run"):
+        rollback(session, undo)
+    return {"deltas": deltas, "dry_run": bool(body.get("dry_run")), **status}
+
+
+def rollback(session, undo):
+    for op in reversed(undo):
+        session.apply(op)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(model, port=None, socket_path=None, quiet=False):
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = UnixHTTPServer(socket_path, WhatIfHandler)
+        where = f"unix:{socket_path}"
+    else:
+        server = ThreadingHTTPServer((DEFAULT_HOST, port or DEFAULT_PORT), WhatIfHandler)
+        where = f"http://{DEFAULT_HOST}:{server.server_address[1]}"
+    server.model = model
+    server.sessions = {}
+    server.lock = threading.Lock()
+    server.quiet = quiet
+
+    print(f"  Listening on {where} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+    return 0
+
+
+# ============================================================================
+# Benchmark
+# ============================================================================
+
+def random_ops(session, count, seed):
+    """A valid random add/remove/move sequence starting from the session's plan."""
+    rng = random.Random(seed)
+    plan = dict(session.placements)
+    size = len(plan)  # adds and removes alternate around the starting plan size
+    candidates = sorted(cid for cid in session.index.course_ids if session.model.units(cid))
+    targets = list(QUARTER_IDS) + [STAGING]
+    ops = []
+    while len(ops) < count:
+        if rng.random() < 0.5:
+            cid = rng.choice(sorted(plan))
+            op = {"op": "move", "course_id": cid, "quarter": rng.choice(targets)}
+            plan[cid] = op["quarter"]
+        elif len(plan) <= size:
+            cid = rng.choice(candidates)
+            if cid in plan:
+                continue
+            op = {"op": "add", "course_id": cid, "quarter": rng.choice(targets)}
+            plan[cid] = op["quarter"]
+        else:
+            cid = rng.choice(sorted(plan))
+            op = {"op": "remove", "course_id": cid}
+            del plan[cid]
+        ops.append(op)
+    return ops
+
+
+def run_benchmark(model, op_count, seed=7):
+    plans = load_json(INITIAL_PLANS_PATH)["plans"]
+    key = max(plans, key=lambda k: (k.count("+"), len(plans[k]["placements"])))
+    majors = key.split("|")[0].split("+")
+    waivers = dict(pair.split(":") for pair in key.split("|")[2].split(",") if pair)
+    placements = plans[key]["placements"]
+
+    session = PlanSession(model, majors, waivers, placements)
+    ops = random_ops(session, op_count, seed)
+    print(f"  Plan:            {key} ({len(placements)} courses, {len(session.index.labels)} requirement slots)")
+    print(f"  Operations:      {len(ops)} (random add / remove / move, seed {seed})")
+
+    # Delta updates
+    start = time.perf_counter()
+    for op in ops:
+        session.apply(op)
+    delta_seconds = time.perf_counter() - start
+
+    # Full re-validation after every op
+    plan = {cid: q for cid, q in placements}
+    start = time.perf_counter()
+    for op in ops:
+        if op["op"] == "remove":
+            del plan[op["course_id"]]
+        else:
+            plan[op["course_id"]] = op["quarter"]
+        full = full_validate(model, session.index, plan)
+    full_seconds = time.perf_counter() - start
+
+    if session.summary() != full:
+        print("  MISMATCH: incremental state differs from full re-validation")
+        return 1
+
+    per_op = lambda seconds: seconds / max(len(ops), 1) * 1e6
+    print(f"  Delta update:    {per_op(delta_seconds):8.1f} µs/op  ({delta_seconds:.3f}s total)")
+    print(f"  Full validation: {per_op(full_seconds):8.1f} µs/op  ({full_seconds:.3f}s total)")
+    print(f"  Speedup:         {full_seconds / delta_seconds:.1f}x")
+    print(f"  Final state:     {len(session.placements)} courses, {session.status()['total_cu']} CU, "
+          f"{session.status()['errors']} errors — matches full re-validation")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental what-if plan validation service")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"TCP port on {DEFAULT_HOST}")
+    parser.add_argument("--socket", help="Serve on a Unix socket instead of TCP")
+    parser.add_argument("--quiet", action="store_true", help="Don't log requests")
+    parser.add_argument("--benchmark", action="store_true", help="Compare delta updates with full re-validation")
+    parser.add_argument("--ops", type=int, default=20000, help="Operations for --benchmark")
+    args = parser.parse_args()
+
+    print(f"CourseHub What-If Service — {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    model = ValidationModel()
+    if args.benchmark:
+        return run_benchmark(model, args.ops)
+    return serve(model, port=args.port, socket_path=args.socket, quiet=args.quiet)
+
+
+if __name__ == "__main__":
+    sys.exit(main())